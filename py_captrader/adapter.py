@@ -19,9 +19,16 @@ class CapTraderAdapter(IBrokerAdapter):
     """
     
 
-    def __init__(self, client: IBKRClient):
+    def __init__(self, client: Optional[IBKRClient] = None):
+        # Default: the shared session client (one connection for all consumers)
+        if client is None:
+            from .session import get_active_client
+            try:
+                client = get_active_client()
+            except ConnectionError as e:
+                raise RuntimeError(f"CRITICAL: Adapter requires an active IBKR session. Run session.connect(...) first. ({e})") from e
         self.client = client
-        if not self.client.is_connected():
+        if self.client is None or not self.client.is_connected():
             raise RuntimeError("CRITICAL: Adapter requires an active IBKR connection in the Client. Run setup first.")
 
     def place_order(self, order_ref: str, symbol: str, quantity: float, 
@@ -152,6 +159,33 @@ class CapTraderAdapter(IBrokerAdapter):
             raise ValueError(f"Unknown symbol: {symbol}")
 
         # 2. Map Timeframe/Lookback to IBKR syntax
+        ib_duration, ib_bar_size = self._ib_history_params(timeframe, lookback)
+
+        # 3. Call Client
+        ib_bars = self.client.get_history(contract, ib_duration, ib_bar_size)
+
+        # 4. Map to DTO
+        return self._map_bars(ib_bars)
+
+    def get_historical_data_batch(self, symbols: List[str], timeframe: str, lookback: str) -> Dict[str, List[BarData]]:
+        """All symbols' history requests in flight at once (unknown symbols / failed requests are omitted)."""
+        contracts = {}
+        for symbol in symbols:
+            contract = self.client.qualify_contract(symbol)
+            if contract:
+                contracts[symbol] = contract
+
+        ib_duration, ib_bar_size = self._ib_history_params(timeframe, lookback)
+        responses = self.client.get_history_many(list(contracts.values()), ib_duration, ib_bar_size)
+        return {
+            symbol: self._map_bars(ib_bars)
+            for symbol, ib_bars in zip(contracts, responses)
+            if not isinstance(ib_bars, BaseException)
+        }
+
+    @staticmethod
+    def _ib_history_params(timeframe: str, lookback: str):
+        """(durationStr, barSizeSetting) for IBKR."""
         # TradeObject nutzt saubere Strings, IBKR ist eigenwillig.
         ib_bar_size = "1 day" # Default
         if timeframe == "1D": ib_bar_size = "1 day"
@@ -160,11 +194,10 @@ class CapTraderAdapter(IBrokerAdapter):
         ib_duration = "1 Y" # Default
         if lookback == "1Y": ib_duration = "1 Y"
         elif lookback == "1M": ib_duration = "1 M"
+        return ib_duration, ib_bar_size
 
-        # 3. Call Client
-        ib_bars = self.client.get_history(contract, ib_duration, ib_bar_size)
-
-        # 4. Map to DTO
+    @staticmethod
+    def _map_bars(ib_bars) -> List[BarData]:
         result = []
         for b in ib_bars:
             ts = b.date
@@ -189,6 +222,16 @@ class CapTraderAdapter(IBrokerAdapter):
             raise ValueError(f"Unknown symbol: {symbol}")
         return self.client.get_market_snapshot(contract)
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """One batched snapshot request for all symbols (unknown symbols are omitted)."""
+        contracts = {}
+        for symbol in symbols:
+            contract = self.client.qualify_contract(symbol)
+            if contract:
+                contracts[symbol] = contract
+        prices = self.client.get_market_snapshots(list(contracts.values()))
+        return dict(zip(contracts, prices))
+
     def get_account_summary(self) -> Dict[str, float]:
         """
         Maps IBKR AccountValues to simplified Dict.
@@ -5,7 +5,7 @@ IBKR Client Wrapper handling Connection Management and Contract Caching.
 import asyncio
 import threading
 import time
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 from ib_insync import IB, Contract, Order, Trade, ExecutionFilter
 import ib_insync.util as ib_util
 
@@ -156,23 +156,55 @@ class IBKRClient:
         )
         return bars
 
+    def get_history_many(self, contracts: List[Contract], duration_str: str, bar_size_setting: str) -> List[Any]:
+        """
+        Fetches historical data for several contracts concurrently (Blocking until all are done).
+        Returns one bar list per contract, in order; a failed request yields its exception instead.
+        """
+        if not contracts:
+            return []
+        requests = [
+            self.ib.reqHistoricalDataAsync(
+                contract,
+                endDateTime='',
+                durationStr=duration_str,
+                barSizeSetting=bar_size_setting,
+                whatToShow='TRADES',
+                useRTH=True,
+                formatDate=1
+            )
+            for contract in contracts
+        ]
+        return self.ib.run(asyncio.gather(*requests, return_exceptions=True))
+
     def get_market_snapshot(self, contract: Contract) -> float:
         """
         Gets a live price snapshot using reqTickers.
         reqTickers is more robust than reqMktData for snapshots as it waits for data.
         """
+        prices = self.get_market_snapshots([contract])
+        return prices[0] if prices else 0.0
+
+    def get_market_snapshots(self, contracts: List[Contract]) -> List[float]:
+        """
+        Live price snapshots for several contracts with ONE reqTickers call
+        (requests run concurrently instead of one round-trip per contract).
+        Returns prices in the order of `contracts`.
+        """
         import math
-        tickers = self.ib.reqTickers(contract)
-        if tickers:
-            t = tickers[0]
+        if not contracts:
+            return []
+        tickers = self.ib.reqTickers(*contracts)
+        prices = []
+        for t in tickers:
             # Use marketPrice() helper which handles last/close/bid-ask fallback
             price = t.marketPrice()
             if math.isnan(price):
                 # Hard fallback logic
                 price = t.last if not math.isnan(t.last) else t.close
                 if math.isnan(price): price = 0.0
-            return price
-        return 0.0
+            prices.append(price)
+        return prices
 
     def get_account_summary(self) -> List[Any]:
         """
@@ -194,4 +226,22 @@ class IBKRClient:
         """
         self.ib.reqAllOpenOrders()
         self.ib.sleep(0.1) # Give time for updates
-        return self.ib.openTrades()
\ No newline at end of file
+        return self.ib.openTrades()
+
+
+# --- Connection Pool ---
+# TWS allows one session per client_id, so one IBKRClient per (host, port, client_id) is shared
+# process-wide. Re-connecting reuses the object and keeps its contract cache warm.
+_CLIENT_POOL: Dict[Tuple[str, int, int], IBKRClient] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def get_or_create(host: str = "127.0.0.1", port: int = 7497, client_id: int = 1) -> IBKRClient:
+    """Returns the pooled client for (host, port, client_id), creating it (unconnected) on first use."""
+    key = (host, port, client_id)
+    with _POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            client = IBKRClient(host=host, port=port, client_id=client_id)
+            _CLIENT_POOL[key] = client
+        return client
@@ -1,4 +1,4 @@
-from .client import IBKRClient
+from .client import IBKRClient, get_or_create
 from typing import Optional
 
 # Global Active Client (Singleton)
@@ -33,7 +33,8 @@ def connect(host: str, port: int, client_id: int):
 
     print(f"🔌 Connecting to IBKR Session ({host}:{port} ID:{client_id})...")
     
-    client = IBKRClient(host=host, port=port, client_id=client_id)
+    # Pooled: a reconnect reuses the client (and its contract cache)
+    client = get_or_create(host=host, port=port, client_id=client_id)
     try:
         client.connect()
         # Bei Erfolg setzen wir den Global State
@@ -1,36 +1,31 @@
 import math
 import statistics
-from typing import List
+from typing import List, Sequence
 from .models import SeriesMetrics
 
-def calculate_drawdown_series(equity_curve: List[float]) -> List[float]:
+def calculate_drawdown_series(equity_curve: Sequence[float]) -> List[float]:
     """ 
     F-MATH-040: Returns list of DD% for each point (High Watermark). 
     DD = (HighWatermark - Current) / HighWatermark
+    Accepts a list or numpy array; vectorized via np.maximum.accumulate.
     """
-    if not equity_curve: return []
-    
-    drawdowns = []
-    peak = equity_curve[0]
+    import numpy as np
+
+    curve = np.asarray(equity_curve, dtype=np.float64)
+    if curve.size == 0: return []
     
-    for val in equity_curve:
-        if val > peak:
-            peak = val
-        
-        dd = 0.0
-        if peak > 0:
-            dd = (peak - val) / peak
-        
-        drawdowns.append(dd)
+    peak = np.maximum.accumulate(curve)
+    # DD stays 0.0 where the peak is not positive
+    drawdowns = np.divide(peak - curve, peak, out=np.zeros_like(curve), where=peak > 0)
         
-    return drawdowns
+    return drawdowns.tolist()
 
-def calculate_series_metrics(equity_curve: List[float], periods_per_year: int = 252) -> SeriesMetrics:
+def calculate_series_metrics(equity_curve: Sequence[float], periods_per_year: int = 252) -> SeriesMetrics:
     """ 
     F-MATH-050: Calc Total Return, CAGR, MaxDD, Volatility.
     Assumes daily data (periods_per_year=252) by default.
     """
-    if not equity_curve or len(equity_curve) < 2:
+    if len(equity_curve) < 2:
         return SeriesMetrics(0,0,0,0,0,0)
         
     start_val = equity_curve[0]
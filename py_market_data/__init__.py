@@ -1,2 +1,3 @@
 from .manager import ChartManager
-from .storage import save_bars, load_bars
+from .storage import save_bars, load_bars, load_bar_array
+from .bars import BarArray
@@ -0,0 +1,163 @@
+"""
+py_market_data/bars.py
+Columnar bar container (SoA). numpy arrays per OHLCV field instead of one BarData per bar.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Sequence, Union
+
+from py_tradeobject.interface import BarData
+
+# utc_offsets value of a row whose timestamp is naive (int32 min, not a valid offset in seconds)
+NAIVE_OFFSET = -(1 << 31)
+
+class BarArray:
+    """
+    Bars as parallel numpy columns, sorted by timestamp (datetime64[us]).
+    Naive timestamps are stored as is. tz-aware ones are stored as UTC, and their
+    UTC offset (seconds) goes to utc_offsets, so bars[i].timestamp comes back
+    with the original offset. Naive rows have NAIVE_OFFSET there.
+    Behaves like a read-only List[BarData]: len(), bool(), iteration, reversed(),
+    bars[i] (BarData, built on first access and cached) and bars[a:b] (BarArray view).
+    """
+    __slots__ = ("timestamps", "opens", "highs", "lows", "closes", "volumes", "utc_offsets", "_items")
+
+    def __init__(self, timestamps, opens, highs, lows, closes, volumes, utc_offsets):
+        self.timestamps = timestamps
+        self.opens = opens
+        self.highs = highs
+        self.lows = lows
+        self.closes = closes
+        self.volumes = volumes
+        self.utc_offsets = utc_offsets
+        self._items: Dict[int, BarData] = {}
+
+    @classmethod
+    def from_columns(cls, timestamps: Sequence[datetime], opens: Sequence[float], highs: Sequence[float],
+                     lows: Sequence[float], closes: Sequence[float], volumes: Sequence[float]) -> 'BarArray':
+        import numpy as np
+        offsets = [
+            NAIVE_OFFSET if ts.tzinfo is None else int(ts.utcoffset().total_seconds())
+            for ts in timestamps
+        ]
+        timestamps = [
+            ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+            for ts in timestamps
+        ]
+        return cls(
+            np.array(timestamps, dtype="datetime64[us]"),
+            np.array(opens, dtype=float),
+            np.array(highs, dtype=float),
+            np.array(lows, dtype=float),
+            np.array(closes, dtype=float),
+            np.array(volumes, dtype=float),
+            np.array(offsets, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[BarData]) -> 'BarArray':
+        if isinstance(bars, BarArray):
+            return bars
+        return cls.from_columns(
+            [b.timestamp for b in bars], [b.open for b in bars], [b.high for b in bars],
+            [b.low for b in bars], [b.close for b in bars], [b.volume for b in bars]
+        )
+
+    @classmethod
+    def empty(cls) -> 'BarArray':
+        return cls.from_columns([], [], [], [], [], [])
+
+    def columns(self) -> tuple:
+        return (self.timestamps, self.opens, self.highs, self.lows, self.closes, self.volumes, self.utc_offsets)
+
+    def datetime_at(self, i: int) -> datetime:
+        """Timestamp of row i as datetime (naive, or aware with the stored UTC offset)."""
+        ts = self.timestamps[i].item()
+        offset = int(self.utc_offsets[i])
+        if offset == NAIVE_OFFSET:
+            return ts
+        delta = timedelta(seconds=offset)
+        return (ts + delta).replace(tzinfo=timezone(delta))
+
+    def take(self, index) -> 'BarArray':
+        """Rows selected by an index array / boolean mask (numpy fancy indexing)."""
+        return BarArray(*(col[index] for col in self.columns()))
+
+    def concat(self, other: 'BarArray') -> 'BarArray':
+        import numpy as np
+        return BarArray(*(np.concatenate((a, b)) for a, b in zip(self.columns(), other.columns())))
+
+    def merge(self, incoming: 'BarArray') -> 'BarArray':
+        """
+        Union by timestamp, sorted. On equal timestamps the later bar wins
+        (incoming over self, and the last duplicate within incoming).
+        """
+        import numpy as np
+        incoming = incoming._dedup_last()
+        existing = self if self._is_strictly_sorted() else self._dedup_last()
+        if len(existing) == 0 or len(incoming) == 0:
+            return incoming if len(existing) == 0 else existing
+
+        # Existing rows overwritten by incoming: binary search in the (sorted, unique) incoming timestamps
+        inc_ts = incoming.timestamps
+        pos = np.searchsorted(inc_ts, existing.timestamps)
+        overwritten = inc_ts[np.minimum(pos, len(inc_ts) - 1)] == existing.timestamps
+        both = existing.take(~overwritten).concat(incoming)
+        return both.take(np.argsort(both.timestamps, kind="stable"))
+
+    def _is_strictly_sorted(self) -> bool:
+        ts = self.timestamps
+        return bool((ts[1:] > ts[:-1]).all())
+
+    def _dedup_last(self) -> 'BarArray':
+        """Sorted by timestamp, one row per timestamp (the last occurrence wins)."""
+        import numpy as np
+        if self._is_strictly_sorted():
+            return self
+        # np.unique keeps the first occurrence: run it on the reversed rows so the last one wins
+        n = len(self)
+        _, rev_idx = np.unique(self.timestamps[::-1], return_index=True)
+        return self.take(n - 1 - rev_idx)
+
+    def to_list(self) -> List[BarData]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return BarArray(*(col[key] for col in self.columns()))
+        n = len(self.timestamps)
+        i = key + n if key < 0 else key
+        if not 0 <= i < n:
+            raise IndexError("BarArray index out of range")
+        bar = self._items.get(i)
+        if bar is None:
+            bar = BarData(
+                timestamp=self.datetime_at(i),
+                open=float(self.opens[i]),
+                high=float(self.highs[i]),
+                low=float(self.lows[i]),
+                close=float(self.closes[i]),
+                volume=float(self.volumes[i])
+            )
+            self._items[i] = bar
+        return bar
+
+    def __iter__(self) -> Iterator[BarData]:
+        for i in range(len(self.timestamps)):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[BarData]:
+        for i in range(len(self.timestamps) - 1, -1, -1):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BarArray):
+            return all((a == b).all() if len(a) == len(b) else False for a, b in zip(self.columns(), other.columns()))
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BarArray(n={len(self)})"
@@ -3,11 +3,12 @@ py_market_data/manager.py
 Core ChartManager Logic.
 """
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 from py_tradeobject.interface import IMarketDataProvider, BarData
-from .storage import load_bars, save_bars
+from .storage import load_bar_array, save_bars
+from .bars import BarArray
 from .utils import is_stale
 
 class ChartManager:
@@ -20,13 +21,13 @@ class ChartManager:
         self.storage_root = os.path.abspath(storage_root)
         self.provider = provider
         
-    def ensure_data(self, ticker: str, timeframe: str, lookback: str = "1Y") -> List[BarData]:
+    def ensure_data(self, ticker: str, timeframe: str, lookback: str = "1Y") -> BarArray:
         """
         Central access method [F-DATA-050].
         1. Checks Disk Cache.
         2. Checks Staleness.
         3. Fetches & Updates if needed (and provider available).
-        4. Returns Data.
+        4. Returns Data (columnar BarArray, indexable/iterable like List[BarData]).
         """
         # 1. Path Resolution
         # Structure: {storage_root}/{ticker}/charts/{timeframe}.json
@@ -34,7 +35,7 @@ class ChartManager:
         chart_path = os.path.join(self.storage_root, ticker, "charts", f"{timeframe}.json")
         
         # 2. Load Existing
-        bars = load_bars(chart_path)
+        bars = load_bar_array(chart_path)
         
         # 3. Check Staleness
         stale = False
@@ -65,6 +66,49 @@ class ChartManager:
         
         return bars
 
+    def ensure_data_many(self, tickers: List[str], timeframe: str, lookback: str = "1Y") -> Dict[str, BarArray]:
+        """
+        ensure_data() for a universe of tickers: stale tickers are fetched with ONE
+        provider batch request per fetch lookback instead of one round-trip per ticker.
+        """
+        # 1. Load Existing (skip the file open for tickers without a cache directory)
+        try:
+            cached_dirs = {entry.name for entry in os.scandir(self.storage_root) if entry.is_dir()}
+        except OSError:
+            cached_dirs = set()
+        result: Dict[str, BarArray] = {}
+        for ticker in tickers:
+            if ticker in cached_dirs:
+                result[ticker] = load_bar_array(os.path.join(self.storage_root, ticker, "charts", f"{timeframe}.json"))
+            else:
+                result[ticker] = BarArray.empty()
+        if not self.provider:
+            return result
+
+        # 2. Group stale tickers by their (smart) fetch lookback
+        groups: Dict[str, List[str]] = {}
+        for ticker, bars in result.items():
+            if not bars:
+                groups.setdefault(lookback, []).append(ticker) # Empty is stale
+            elif is_stale(bars[-1].timestamp, timeframe):
+                groups.setdefault(self._get_smart_duration(bars[-1].timestamp), []).append(ticker)
+
+        # 3. One batch fetch per group, merge & save per ticker
+        for fetch_lookback, symbols in groups.items():
+            try:
+                fetched = self.provider.get_historical_data_batch(symbols, timeframe, fetch_lookback)
+            except Exception as e:
+                print(f"  [ChartManager] Warning: Could not update {', '.join(symbols)} ({timeframe}): {e}")
+                continue
+            for ticker in symbols:
+                incoming = fetched.get(ticker)
+                if not incoming:
+                    continue # Keep cached bars
+                new_bars = result[ticker].merge(BarArray.from_bars(incoming))
+                save_bars(os.path.join(self.storage_root, ticker, "charts", f"{timeframe}.json"), new_bars)
+                result[ticker] = new_bars
+        return result
+
     def _get_smart_duration(self, last_bar_timestamp: datetime) -> str:
         """
         Calculates the required duration string (IBKR format) to fill the gap
@@ -82,7 +126,7 @@ class ChartManager:
             
         return f"{days_needed} D"
 
-    def _fetch_and_merge(self, ticker: str, timeframe: str, lookback: str, existing_bars: List[BarData]) -> List[BarData]:
+    def _fetch_and_merge(self, ticker: str, timeframe: str, lookback: str, existing_bars: BarArray) -> BarArray:
         """
         Fetched new data and merges it with existing.
         [F-DATA-080] Gap Handling / Append Strategy.
@@ -92,22 +136,13 @@ class ChartManager:
         # But IBKR lookback strings are static. 
         # Strategy:
         # If existing data is robust, we could query shorter period.
-        # But simplistic approach: Query requested lookback, then merge dict-based by timestamp.
+        # But simplistic approach: Query requested lookback, then merge by timestamp.
         
         # 1. Fetch
         incoming_bars = self.provider.get_historical_data(ticker, timeframe, lookback)
         if not incoming_bars:
             return existing_bars # Keep old if fetch fails? Or return empty?
             
-        # 2. Merge (Dict based on timestamp to dedup/overwrite)
+        # 2. Merge columns (dedup on timestamp, sorted)
         # Last write wins (Incoming overwrites existing)
-        merged_map = {}
-        for b in existing_bars:
-            merged_map[b.timestamp] = b
-            
-        for b in incoming_bars:
-            merged_map[b.timestamp] = b
-            
-        # 3. Sort back to list
-        sorted_bars = sorted(merged_map.values(), key=lambda x: x.timestamp)
-        return sorted_bars
+        return existing_bars.merge(BarArray.from_bars(incoming_bars))
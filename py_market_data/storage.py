@@ -1,12 +1,15 @@
 """
 py_market_data/storage.py
 Handles JSON serialization/deserialization with compact keys.
+Loads are served from a columnar binary sidecar ({timeframe}.json.cols) while it matches the JSON.
 """
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from py_tradeobject.interface import BarData
+from py_tradeobject.models import loads_json
+from .bars import BarArray
 
 # Compact Key Mapping
 # t = timestamp
@@ -16,24 +19,33 @@ from py_tradeobject.interface import BarData
 # c = close
 # v = volume
 
-def save_bars(path: str, bars: List[BarData]):
+# Columnar sidecar: header int64[4] = (version, json mtime_ns, json size, n),
+# then timestamps as int64 microseconds since 1970-01-01 (UTC for tz-aware bars), then o/h/l/c/v
+# as float64[n] each, then the UTC offsets in seconds as int64[n] (see BarArray.utc_offsets).
+COLS_SUFFIX = ".cols"
+_COLS_VERSION = 2
+_HEADER_BYTES = 32
+
+def save_bars(path: str, bars: Sequence[BarData]):
     """
-    Saves BarData list to JSON with compact keys.
+    Saves bars (BarData list or BarArray) to JSON with compact keys.
     """
+    bars = BarArray.from_bars(bars)
     data = []
-    for bar in bars:
+    for i, (o, h, l, c, v) in enumerate(zip(*(col.tolist() for col in bars.columns()[1:6]))):
+        ts = bars.datetime_at(i)
         # Convert datetime to ISO string YYYY-MM-DD (if daily) or full ISO?
         # Requirement F-DATA-060: "t": "2023-10-27" example suggests date string for daily.
         # But we need to support intraday too. ISO format is safest.
-        ts_str = bar.timestamp.isoformat()
+        ts_str = ts.isoformat()
         
         row = {
             "t": ts_str,
-            "o": bar.open,
-            "h": bar.high,
-            "l": bar.low,
-            "c": bar.close,
-            "v": bar.volume
+            "o": o,
+            "h": h,
+            "l": l,
+            "c": c,
+            "v": v
         }
         data.append(row)
         
@@ -43,29 +55,85 @@ def save_bars(path: str, bars: List[BarData]):
     with open(path, 'w') as f:
         json.dump(data, f, separators=(',', ':')) # Minimal whitespace
 
+    _save_columns(path, bars)
+
 def load_bars(path: str) -> List[BarData]:
     """
-    Loads BarData list from compact JSON.
+    Loads BarData list from compact JSON (via the columnar sidecar when it is current).
     Returns empty list if file not found or error.
     """
-    if not os.path.exists(path):
-        return []
-        
+    return load_bar_array(path).to_list()
+
+def load_bar_array(path: str) -> BarArray:
+    """
+    Loads bars as BarArray. Empty BarArray if file not found or error.
+    """
     try:
-        with open(path, 'r') as f:
-            data = json.load(f)
-            
-        bars = []
-        for row in data:
-            bars.append(BarData(
-                timestamp=datetime.fromisoformat(row["t"]),
-                open=float(row["o"]),
-                high=float(row["h"]),
-                low=float(row["l"]),
-                close=float(row["c"]),
-                volume=float(row["v"])
-            ))
+        st = os.stat(path)
+    except OSError:
+        return BarArray.empty()
+
+    bars = _load_columns(path, st)
+    if bars is not None:
         return bars
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        
+    try:
+        with open(path, 'rb') as f:
+            data = loads_json(f.read())
+
+        bars = BarArray.from_columns(
+            [datetime.fromisoformat(row["t"]) for row in data],
+            [float(row["o"]) for row in data],
+            [float(row["h"]) for row in data],
+            [float(row["l"]) for row in data],
+            [float(row["c"]) for row in data],
+            [float(row["v"]) for row in data],
+        )
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
         print(f"Error loading chart data from {path}: {e}")
-        return []
+        return BarArray.empty()
+
+    # JSON written by an older version or edited by hand: (re)build the sidecar
+    _save_columns(path, bars)
+    return bars
+
+def _save_columns(path: str, bars: BarArray):
+    """Writes the columnar sidecar for the JSON at `path`."""
+    import numpy as np
+    try:
+        st = os.stat(path)
+        tmp_path = path + COLS_SUFFIX + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.array((_COLS_VERSION, st.st_mtime_ns, st.st_size, len(bars)), dtype=np.int64).tofile(f)
+            bars.timestamps.astype("datetime64[us]").view(np.int64).tofile(f)
+            for col in bars.columns()[1:6]:
+                np.asarray(col, dtype=np.float64).tofile(f)
+            bars.utc_offsets.astype(np.int64).tofile(f)
+        os.replace(tmp_path, path + COLS_SUFFIX)
+    except OSError:
+        pass # Sidecar is an optimization only
+
+def _load_columns(path: str, st: os.stat_result) -> Optional[BarArray]:
+    """Reads the sidecar if it belongs to the current JSON (same mtime_ns and size), else None."""
+    import numpy as np
+    try:
+        with open(path + COLS_SUFFIX, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+
+    if len(raw) < _HEADER_BYTES:
+        return None
+    header = np.frombuffer(raw, dtype=np.int64, count=4)
+    if tuple(header[:3].tolist()) != (_COLS_VERSION, st.st_mtime_ns, st.st_size):
+        return None
+    n = int(header[3])
+    if len(raw) != _HEADER_BYTES + 7 * 8 * n:
+        return None
+
+    body = np.frombuffer(raw, dtype=np.int64, offset=_HEADER_BYTES).reshape(7, n)
+    return BarArray(
+        body[0].view("datetime64[us]"),
+        *(row.view(np.float64) for row in body[1:6]),
+        body[6].astype(np.int32)
+    )
@@ -1,12 +1,85 @@
 import os
-import json
-from datetime import datetime
-from typing import List, Optional
+import pickle
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from .objects import PortfolioSnapshot, TradeResult, PortfolioPosition, PortfolioOrder
-from py_tradeobject.models import TradeState, TradeStatus, TransactionType
-from py_tradeobject.core import TradeObject
+from py_tradeobject.models import TradeState, TradeStatus, TransactionType, load_trade_dict
+from py_tradeobject.core import TradeObject, replay_journal, JOURNAL_SUFFIX
 from py_tradeobject.interface import IBrokerAdapter
 
+try:
+    # Optional JIT for the per-trade replay kernel
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Parsed-trade cache inside trades_dir:
+# {json path: (signature, pickled (TradeState, journal_seq, journal_records, closed summary))}
+CACHE_DIR = ".cache"
+INDEX_FILE = "index.pkl"
+# Bump when the pickled blob layout or the pickled model classes change: older indexes are discarded
+INDEX_VERSION = 2
+# Below this many files to parse, a process pool costs more (spawn + imports) than it saves
+PARALLEL_MIN_FILES = 64
+
+def _parse_trade_file(job: Tuple[str, int]) -> Optional[bytes]:
+    """
+    Parses one trade file (+ journal) into a pickled (TradeState, journal_seq, journal_records, summary) blob
+    (journal_seq / journal_records after the replay, as TradeObject._load() keeps them).
+    Module-level so it can run in a worker process. None if the file is unreadable.
+    """
+    full_path, size = job
+    try:
+        data = load_trade_dict(full_path, size)
+        state = TradeState.from_dict(data)
+        journal_seq = data.get("journal_seq", 0)
+        # Apply events appended since the last snapshot
+        last_seq, records = replay_journal(state, full_path, journal_seq)
+        # Summary written at save time is only current if the journal added nothing since
+        summary = data.get("summary") if last_seq == journal_seq else None
+        if summary is None or state.status not in (TradeStatus.CLOSED, TradeStatus.ARCHIVED):
+            summary = state.closed_summary()
+        return pickle.dumps((state, last_seq, records, summary), pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+def _replay_prefix(qty, price, comm, qty_after, cash_after, cost_after):
+    """
+    Running position state after each transaction, written into the *_after buffers.
+    Plain loop over float64 columns: interpreted over array('d'), compiled when numba is installed.
+    """
+    q_tot = 0.0
+    cash = 0.0
+    cost_basis = 0.0 # Simple Avg Price Replay (might need FIFO/LIFO logic later)
+    for i in range(len(qty)):
+        q = qty[i]
+        # Cash Flow
+        # Buying: - (Price * Qty) - Comm
+        # Selling: + (Price * Qty) - Comm
+        # Qty is signed (+ for Long-Buys, - for Long-Sells), so:
+        # Cash Delta = -(tx.quantity * tx.price) - tx.commission
+        cash += -(q * price[i]) - comm[i]
+        
+        # Position Update
+        q_tot += q
+        
+        # Update Cost Basis (Simple Weighted Avg for Longs)
+        # If we are adding to position (Long Buy)
+        if q > 0:
+            total_cost = (cost_basis * (q_tot - q)) + (q * price[i])
+            cost_basis = total_cost / q_tot if q_tot != 0 else 0.0
+        
+        qty_after[i] = q_tot
+        cash_after[i] = cash
+        cost_after[i] = cost_basis
+
+if njit is not None:
+    _replay_prefix_jit = njit(cache=True)(_replay_prefix)
+else:
+    _replay_prefix_jit = None
+
 class HistoryFactory:
     """
     F-PS-030, F-PS-040, F-PS-080: History interactions.
@@ -15,31 +88,152 @@ class HistoryFactory:
         self.trades_dir = trades_dir
         self.provider = provider
         self._cache: List[TradeObject] = []
+        # (ticker, trade id) -> (n_transactions, timestamps, qty_after, cash_after, cost_basis_after)
+        self._tx_prefix: Dict[Tuple[str, str], Tuple] = {}
+        # ticker -> first TradeObject in _cache (see _trade_for)
+        self._by_ticker: Dict[str, TradeObject] = {}
+        self._by_ticker_src: Optional[List[TradeObject]] = None
+        self._by_ticker_len = 0
+        # Closed trades sorted by exit timestamp (parallel lists, for bisect)
+        self._closed_ts: List[datetime] = []
+        self._closed_results: List[TradeResult] = []
         
     def load_all_trades(self):
         """
         F-PS-050: Recursively loads all trade JSONs from trades_dir.
+        Files whose (mtime_ns, size) - and that of their journal - are unchanged since the
+        last load are restored from the pickled index instead of being re-parsed.
         """
         self._cache = []
+        self._tx_prefix = {}
+        self._closed_ts = []
+        self._closed_results = []
         if not os.path.exists(self.trades_dir):
             return
 
-        for root, _, files in os.walk(self.trades_dir):
-            for file in files:
-                if file.endswith(".json"):
-                    full_path = os.path.join(root, file)
-                    try:
-                        with open(full_path, "r") as f:
-                            data = json.load(f)
-                            trade_obj = TradeObject.from_dict(data)
-                            
-                            # Inject Provider if available
-                            if self.provider:
-                                trade_obj.set_broker(self.provider)
-                                
-                            self._cache.append(trade_obj)
-                    except Exception as e:
-                        pass
+        index = self._read_index()
+        files = list(self._scan_trade_files(self.trades_dir))
+
+        # Parse new/changed files (in parallel for large batches)
+        jobs = [
+            (full_path, signature[0][1]) for full_path, signature in files
+            if full_path not in index or index[full_path][0] != signature
+        ]
+        parsed = dict(zip((path for path, _ in jobs), self._parse_files(jobs)))
+
+        seen = {}
+        closed = []
+        repaired = False
+        for full_path, signature in files:
+            blob = parsed[full_path] if full_path in parsed else index[full_path][1]
+            entry = self._unpickle_entry(blob)
+            if entry is None and full_path not in parsed:
+                # Cached blob no longer restores (corrupt, or written by other code): parse the file
+                blob = _parse_trade_file((full_path, signature[0][1]))
+                entry = self._unpickle_entry(blob)
+                repaired = True
+            if entry is None:
+                continue
+            state, journal_seq, journal_records, summary = entry
+            seen[full_path] = (signature, blob)
+            if summary is not None:
+                closed.append(self._closed_result(state, summary))
+
+            trade_obj = TradeObject.from_state(state, journal_seq, journal_records=journal_records)
+            # Inject Provider if available
+            if self.provider:
+                trade_obj.set_broker(self.provider)
+                
+            self._cache.append(trade_obj)
+
+        closed.sort(key=lambda r: r.exit_date) # Stable: ties keep load order
+        self._closed_ts = [r.exit_date for r in closed]
+        self._closed_results = closed
+
+        # Only rewrite the index if a file was added, changed or removed (or an entry was repaired)
+        if repaired or seen.keys() != index.keys() or any(index[p][0] != v[0] for p, v in seen.items()):
+            self._write_index(seen)
+
+    @staticmethod
+    def _unpickle_entry(blob: Optional[bytes]) -> Optional[Tuple]:
+        """(TradeState, journal_seq, journal_records, summary) from a _parse_trade_file blob; None if it does not restore."""
+        if blob is None:
+            return None
+        try:
+            state, journal_seq, journal_records, summary = pickle.loads(blob)
+            if not isinstance(state, TradeState):
+                return None
+            return state, journal_seq, journal_records, summary
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                IndexError, TypeError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _parse_files(jobs: List[Tuple[str, int]]) -> List[Optional[bytes]]:
+        """Runs _parse_trade_file over jobs; a process pool for large batches, serial otherwise."""
+        if len(jobs) >= PARALLEL_MIN_FILES:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                # spawn, not fork: the live process runs ib_insync threads and holds sockets
+                with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                         mp_context=multiprocessing.get_context("spawn")) as ex:
+                    return list(ex.map(_parse_trade_file, jobs, chunksize=32))
+            except (OSError, RuntimeError, multiprocessing.ProcessError) as e:
+                # No worker processes available (sandbox, frozen app) or a worker died
+                print(f"  [HistoryFactory] Warning: process pool unavailable ({e!r}), parsing {len(jobs)} files serially")
+        return [_parse_trade_file(job) for job in jobs]
+
+    @staticmethod
+    def _scan_trade_files(root: str):
+        """
+        Yields (json path, signature) for every trade file below root (same order as os.walk).
+        The signature covers the snapshot and its journal; both come from the scandir entries,
+        so no extra stat() per file is needed.
+        """
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            return
+        stats = {}
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name != CACHE_DIR:
+                    subdirs.append(entry.path)
+            else:
+                st = entry.stat()
+                stats[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        for name, st in stats.items():
+            if name.endswith(".json"):
+                journal = stats.get(name[:-len(".json")] + JOURNAL_SUFFIX)
+                yield os.path.join(root, name), (st, journal)
+
+        for path in subdirs:
+            yield from HistoryFactory._scan_trade_files(path)
+
+    def _read_index(self) -> Dict:
+        try:
+            with open(os.path.join(self.trades_dir, CACHE_DIR, INDEX_FILE), "rb") as f:
+                index = pickle.load(f)
+        except Exception:
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {} # Written by another version: rebuild
+        files = index.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _write_index(self, index: Dict):
+        cache_dir = os.path.join(self.trades_dir, CACHE_DIR)
+        tmp_path = os.path.join(cache_dir, INDEX_FILE + ".tmp")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": INDEX_VERSION, "files": index}, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, os.path.join(cache_dir, INDEX_FILE))
+        except OSError:
+            pass # Cache is an optimization only (e.g. read-only trades_dir)
 
     def get_snapshot_at(self, date: datetime) -> PortfolioSnapshot:
         """
@@ -53,62 +247,17 @@ class HistoryFactory:
             state = trade._state # Accessing protected member for analysis
             if not state: continue
 
-            # Calculate Net Quantity and Cash Flow for this trade up to `date`
-            qty = 0.0
-            avg_price = 0.0 # This might need FIFO/LIFO logic or just Avg Cost
-            # TradeState tracks metrics dynamically, but for point-in-time we must replay.
-            
-            # Simple Avg Price Replay
-            cost_basis = 0.0
+            # Position state after the last transaction <= `date` (binary search in the prefix scan)
+            _, timestamps, qty_after, cash_after, cost_after = self._get_tx_prefix(state)
+            idx = bisect_right(timestamps, date)
+            if idx == 0: continue
             
-            trade_active = False
-            
-            for tx in state.transactions:
-                if tx.timestamp > date: continue
-                
-                # Apply TX
-                # Cash Flow
-                # Buying: - (Price * Qty) - Comm
-                # Selling: + (Price * Qty) - Comm
-                
-                # TransactionType: ENTRY, EXIT, ADJUSTMENT
-                # Qty is signed in TradeTransaction?
-                # models.py says: "quantity: float # Signed Value: + for Long-Buys..."
-                # Wait, usually for Long: Buy=+Qty, Sell=-Qty.
-                # Transaction Cost = Price * Qty.
-                # If Buy 10 @ 100 -> Cost 1000. Cash -1000.
-                
-                # Cash Delta = -(tx.quantity * tx.price) - tx.commission
-                cash_delta = -(tx.quantity * tx.price) - tx.commission
-                total_cash += cash_delta
-                
-                # Position Update
-                qty += tx.quantity
-                
-                # Update Cost Basis (Simple Weighted Avg for Longs)
-                # If we are adding to position (Long Buy)
-                if tx.quantity > 0:
-                     total_cost = (cost_basis * (qty - tx.quantity)) + (tx.quantity * tx.price)
-                     cost_basis = total_cost / qty if qty != 0 else 0
-                     
-                trade_active = (qty != 0)
+            total_cash += cash_after[idx - 1]
+            qty = qty_after[idx - 1]
             
             # If active position exists
-            if trade_active and qty != 0:
-                # Valuation
-                current_price = self._get_price_at(state.ticker, date)
-                market_val = qty * current_price
-                unrealized = market_val - (qty * cost_basis)
-                
-                positions.append(PortfolioPosition(
-                    ticker=state.ticker,
-                    quantity=qty,
-                    avg_price=cost_basis,
-                    current_price=current_price,
-                    market_value=market_val,
-                    unrealized_pnl=unrealized,
-                    trade_id=state.id
-                ))
+            if qty != 0:
+                positions.append(self._make_position(state, qty, cost_after[idx - 1], date))
                 
         # Calculate Equity
         equity = total_cash + sum(p.market_value for p in positions)
@@ -129,37 +278,9 @@ class HistoryFactory:
                     break
                 
                 # Update state
-                orders_state[log.order_id] = {
-                    "status": log.status,
-                    "action": log.action,
-                    "log_obj": log
-                }
-
-            # Filter for active
-            for oid, state_dict in orders_state.items():
-                # What statuses are active?
-                # SUBMITTED, PARTIALLY_FILLED, PENDING
-                # Inactive: FILLED, CANCELLED, REJECTED
-                
-                status = state_dict["status"]
-                if status not in ["FILLED", "CANCELLED", "REJECTED", "EXPIRED"]:
-                    # It's active!
-                    log = state_dict["log_obj"]
-                    
-                    # Determine price (Limit or Stop?)
-                    # PortfolioOrder expects 'price'.
-                    price = log.limit_price if log.limit_price is not None else log.stop_price
-                    if price is None: price = 0.0
-                    
-                    active_orders.append(PortfolioOrder(
-                        ticker=state.ticker,
-                        order_id=oid,
-                        action=state_dict.get("action", "UNKNOWN"),
-                        type=log.type,
-                        qty=log.quantity,
-                        price=price,
-                        trade_id=state.id
-                    ))
+                orders_state[log.order_id] = log
+
+            active_orders.extend(self._active_orders_of(state, orders_state))
 
         return PortfolioSnapshot(
             timestamp=date,
@@ -170,89 +291,180 @@ class HistoryFactory:
             source="HISTORY"
         )
 
+    def _make_position(self, state: TradeState, qty: float, cost_basis: float, date: datetime) -> PortfolioPosition:
+        """Values an open position at `date`."""
+        current_price = self._get_price_at(state.ticker, date)
+        market_val = qty * current_price
+        unrealized = market_val - (qty * cost_basis)
+        
+        return PortfolioPosition(
+            ticker=state.ticker,
+            quantity=qty,
+            avg_price=cost_basis,
+            current_price=current_price,
+            market_value=market_val,
+            unrealized_pnl=unrealized,
+            trade_id=state.id
+        )
+
+    @staticmethod
+    def _active_orders_of(state: TradeState, orders_state: Dict) -> List[PortfolioOrder]:
+        """Filters the latest log per order_id down to the orders still working."""
+        active_orders = []
+        for oid, log in orders_state.items():
+            # What statuses are active?
+            # SUBMITTED, PARTIALLY_FILLED, PENDING
+            # Inactive: FILLED, CANCELLED, REJECTED
+            if log.status not in ["FILLED", "CANCELLED", "REJECTED", "EXPIRED"]:
+                # It's active!
+                # Determine price (Limit or Stop?)
+                # PortfolioOrder expects 'price'.
+                price = log.limit_price if log.limit_price is not None else log.stop_price
+                if price is None: price = 0.0
+                
+                active_orders.append(PortfolioOrder(
+                    ticker=state.ticker,
+                    order_id=oid,
+                    action=log.action,
+                    type=log.type,
+                    qty=log.quantity,
+                    price=price,
+                    trade_id=state.id
+                ))
+        return active_orders
+
+    def _get_tx_prefix(self, state: TradeState) -> Tuple:
+        """
+        Replays the (time-sorted) transactions of a trade once and memoizes the state
+        after each one, so point-in-time queries are a bisect instead of a rescan.
+        Rebuilt when the number of transactions changed.
+        """
+        key = (state.ticker, state.id)
+        prefix = self._tx_prefix.get(key)
+        if prefix is not None and prefix[0] == len(state.transactions):
+            return prefix
+
+        n = len(state.transactions)
+        timestamps = [tx.timestamp for tx in state.transactions]
+        qty_after, cash_after, cost_after = (array('d', bytes(8 * n)) for _ in range(3))
+        columns = state.columns() + (qty_after, cash_after, cost_after)
+        if _replay_prefix_jit is not None and n:
+            import numpy as np
+            # Zero-copy float64 views: the kernel writes straight into the array('d') buffers
+            _replay_prefix_jit(*(np.frombuffer(col, dtype=np.float64) for col in columns))
+        else:
+            _replay_prefix(*columns)
+
+        prefix = (len(state.transactions), timestamps, qty_after, cash_after, cost_after)
+        self._tx_prefix[key] = prefix
+        return prefix
+
     def get_closed_trades(self, start: datetime, end: datetime) -> List[TradeResult]:
         """
-        F-PS-080: Returns list of trades closed within window.
+        F-PS-080: Returns list of trades closed within window (ordered by exit date).
+        Served from the closed-trade index built in load_all_trades().
         """
-        results = []
-        for trade in self._cache:
-            state = trade._state
-            if not state: continue
+        lo = bisect_left(self._closed_ts, start)
+        hi = bisect_right(self._closed_ts, end)
+        return self._closed_results[lo:hi]
 
-            if state.status in [TradeStatus.CLOSED, TradeStatus.ARCHIVED]:
-                # Check exit date (Timestamp of last transaction)
-                if not state.transactions: continue
-                
-                # Sort transactions by time to be sure
-                sorted_tx = sorted(state.transactions, key=lambda x: x.timestamp)
-                last_tx = sorted_tx[-1]
-                
-                if start <= last_tx.timestamp <= end:
-                    entry_tx = sorted_tx[0]
-                    entry_date = entry_tx.timestamp
-                    exit_date = last_tx.timestamp
-                    
-                    # Calculate PnL: Sum of all cash flows (Prices are positive, Qty signed?)
-                    # TradeTransaction models usually store:
-                    # type=ENTRY, quantity=10 (Long), price=100
-                    # type=EXIT, quantity=-10 (Sell), price=110
-                    # Cash Flow = -(Qty * Price) - Commission
-                    
-                    pnl = 0.0
-                    total_bought_qty = 0.0
-                    
-                    for tx in sorted_tx:
-                        cash_flow = -(tx.quantity * tx.price) - tx.commission
-                        pnl += cash_flow
-                        if tx.quantity > 0:
-                            total_bought_qty += tx.quantity
-
-                    # Direction
-                    direction = "LONG" if total_bought_qty > 0 else "SHORT" # Simplified
-                    
-                    results.append(TradeResult(
-                        ticker=state.ticker,
-                        direction=direction,
-                        entry_date=entry_date,
-                        exit_date=exit_date,
-                        entry_price=entry_tx.price,
-                        exit_price=last_tx.price,
-                        qty=total_bought_qty,
-                        pnl_absolute=pnl,
-                        pnl_percent=0.0, # Todo: Calculate return on risk/capital
-                        r_multiple=0.0, # Todo: Requires initial risk
-                        duration_days=(exit_date - entry_date).days
-                    ))
-        return results
+    @staticmethod
+    def _closed_result(state: TradeState, summary: Dict) -> TradeResult:
+        entry_date = datetime.fromisoformat(summary["entry_ts"])
+        exit_date = datetime.fromisoformat(summary["close_ts"])
+        return TradeResult(
+            ticker=state.ticker,
+            direction="LONG" if summary["qty"] > 0 else "SHORT", # Simplified
+            entry_date=entry_date,
+            exit_date=exit_date,
+            entry_price=summary["entry_price"],
+            exit_price=summary["exit_price"],
+            qty=summary["qty"],
+            pnl_absolute=summary["pnl_absolute"],
+            pnl_percent=0.0, # Todo: Calculate return on risk/capital
+            r_multiple=0.0, # Todo: Requires initial risk
+            duration_days=summary["duration_days"]
+        )
 
     def get_daily_snapshots(self, start_date: datetime, end_date: datetime) -> List[PortfolioSnapshot]:
         """
         F-PS-070: Generates a list of PortfolioSnapshots, one for each day in range (EOD).
         """
-        results = []
+        # Day grid (EOD = 23:59:59.999999)
+        eods: List[datetime] = []
         current = start_date
-        
         while current <= end_date:
-            # Set to End of Day (23:59:59)
-            eod_timestamp = current.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            # Replay
-            snapshot = self.get_snapshot_at(eod_timestamp)
-            results.append(snapshot)
-            
-            # Next day
-            # If current is datetime, use timedelta
-            import datetime as dt
-            current += dt.timedelta(days=1)
-            
-        return results
+            eods.append(current.replace(hour=23, minute=59, second=59, microsecond=999999))
+            current += timedelta(days=1)
+
+        n_days = len(eods)
+        # Per-day cash = sum of trade cash flows up to that day (same base as get_snapshot_at)
+        cash = [0.0] * n_days
+        positions: List[List[PortfolioPosition]] = [[] for _ in eods]
+        active_orders: List[List[PortfolioOrder]] = [[] for _ in eods]
+
+        # One forward sweep per trade: the sorted transaction / order timelines are merged
+        # against the sorted day grid, so each event is visited once for the whole window.
+        for trade in self._cache:
+            state = trade._state
+            if not state: continue
+
+            _, timestamps, qty_after, cash_after, cost_after = self._get_tx_prefix(state)
+            n_tx = len(timestamps)
+            idx = 0
+            for d, eod in enumerate(eods):
+                while idx < n_tx and timestamps[idx] <= eod:
+                    idx += 1
+                if idx == 0: continue
+                cash[d] += cash_after[idx - 1]
+                qty = qty_after[idx - 1]
+                if qty != 0:
+                    positions[d].append(self._make_position(state, qty, cost_after[idx - 1], eod))
+
+        for trade in self._cache:
+            state = trade._state
+            if not getattr(state, 'order_history', None): 
+                continue
+
+            logs = sorted(state.order_history, key=lambda x: x.timestamp)
+            n_logs = len(logs)
+            orders_state = {} # order_id -> latest log, carried from day to day
+            idx = 0
+            for d, eod in enumerate(eods):
+                while idx < n_logs and logs[idx].timestamp <= eod:
+                    orders_state[logs[idx].order_id] = logs[idx]
+                    idx += 1
+                active_orders[d].extend(self._active_orders_of(state, orders_state))
+
+        return [
+            PortfolioSnapshot(
+                timestamp=eods[d],
+                cash=cash[d],
+                equity=cash[d] + sum(p.market_value for p in positions[d]),
+                positions=positions[d],
+                active_orders=active_orders[d],
+                source="HISTORY"
+            )
+            for d in range(n_days)
+        ]
+
+    def _trade_for(self, ticker: str) -> Optional[TradeObject]:
+        """First cached TradeObject of ticker (dict lookup; index rebuilt when _cache changed)."""
+        cache = self._cache
+        if self._by_ticker_src is not cache or self._by_ticker_len != len(cache):
+            self._by_ticker = {}
+            for t in cache:
+                self._by_ticker.setdefault(t.ticker, t)
+            self._by_ticker_src = cache
+            self._by_ticker_len = len(cache)
+        return self._by_ticker.get(ticker)
 
     def _get_price_at(self, ticker: str, date: datetime) -> float:
         """Helper to get price from TradeObject's ChartManager or fallback."""
         # Find ANY trade object for this ticker 
         # (Charts are per ticker, so any instance logic is fine, or create temp one)
         
-        trade = next((t for t in self._cache if t.ticker == ticker), None)
+        trade = self._trade_for(ticker)
         if not trade:
              # If we don't have a trade in cache, we can't easily access chart manager logic encapsulated in TradeObject
              # unless we instantiate a dummy one.
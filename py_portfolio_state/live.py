@@ -1,9 +1,17 @@
 import os
-import json
 from datetime import datetime
+from operator import attrgetter
 from typing import Optional, List, Any
 from py_tradeobject.interface import IBrokerAdapter
-from .objects import PortfolioSnapshot, PortfolioPosition
+from py_tradeobject.models import dumps_json
+from .objects import PortfolioSnapshot, PortfolioPosition, PortfolioOrder
+
+# Field extractors for ib_insync Position / Trade objects (one C call per row)
+_POS_FIELDS = attrgetter('contract.symbol', 'position', 'avgCost')
+_ORDER_FIELDS = attrgetter(
+    'contract.symbol', 'order.orderId', 'order.action', 'order.orderType',
+    'order.totalQuantity', 'order.lmtPrice', 'order.auxPrice', 'order.orderRef'
+)
 
 class LivePortfolioManager:
     """
@@ -16,8 +24,8 @@ class LivePortfolioManager:
         """Persists the latest snapshot to disk."""
         path = "./data/portfolio_latest.json"
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(snapshot.to_dict(), f, indent=2)
+        with open(path, "wb") as f:
+            f.write(dumps_json(snapshot.to_dict(), indent=True))
 
     def snapshot(self, ticker: Optional[str] = None) -> PortfolioSnapshot:
         """
@@ -29,27 +37,22 @@ class LivePortfolioManager:
         cash = summary.get('TotalCashValue', 0.0)
         equity = summary.get('NetLiquidation', 0.0)
         
-        # 2. Positions
-        raw_positions = self.broker.get_positions()
-        mapped_positions: List[PortfolioPosition] = []
-        for pos in raw_positions:
-            contract = pos.contract
-            
-            # Filter by Ticker if requested
-            if ticker and contract.symbol != ticker:
-                continue
+        # 2. Positions (scoped by the broker if a ticker filter is requested)
+        raw_positions = self.broker.get_positions_for(ticker) if ticker else self.broker.get_positions()
+        open_positions = [row for row in map(_POS_FIELDS, raw_positions) if row[1] != 0]
 
-            qty = pos.position
-            avg_price = pos.avgCost
-            if qty == 0: continue
-            
-            try:
-                current_price = self.broker.get_current_price(contract.symbol)
-            except Exception:
-                current_price = 0.0
+        # One batched price request instead of a round-trip per position
+        try:
+            prices = self.broker.get_current_prices(list({row[0] for row in open_positions}))
+        except Exception:
+            prices = {}
+
+        mapped_positions: List[PortfolioPosition] = []
+        for symbol, qty, avg_price in open_positions:
+            current_price = prices.get(symbol, 0.0)
                 
             mapped_positions.append(PortfolioPosition(
-                ticker=contract.symbol,
+                ticker=symbol,
                 quantity=qty,
                 avg_price=avg_price,
                 current_price=current_price,
@@ -58,27 +61,19 @@ class LivePortfolioManager:
             ))
             
         # 3. Active Orders
-        raw_orders = self.broker.get_all_open_orders() 
-        from .objects import PortfolioOrder
+        raw_orders = self.broker.get_open_orders_for(ticker) if ticker else self.broker.get_all_open_orders()
         
         mapped_orders: List[PortfolioOrder] = []
-        for trade in raw_orders:
-            order = trade.order
-            contract = trade.contract
-
-            # Filter by Ticker if requested
-            if ticker and contract.symbol != ticker:
-                continue
-            
-            price = order.auxPrice if (order.auxPrice and order.auxPrice > 0) else order.lmtPrice
+        for symbol, order_id, action, order_type, total_qty, lmt_price, aux_price, order_ref in map(_ORDER_FIELDS, raw_orders):
+            price = aux_price if (aux_price and aux_price > 0) else lmt_price
             mapped_orders.append(PortfolioOrder(
-                ticker=contract.symbol,
-                order_id=str(order.orderId),
-                action=order.action,
-                type=order.orderType,
-                qty=order.totalQuantity,
+                ticker=symbol,
+                order_id=str(order_id),
+                action=action,
+                type=order_type,
+                qty=total_qty,
                 price=price or 0.0,
-                trade_id=order.orderRef if order.orderRef else ""
+                trade_id=order_ref if order_ref else ""
             ))
 
         # 4. Create Snapshot
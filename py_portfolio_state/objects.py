@@ -1,8 +1,9 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
+from operator import attrgetter
 from typing import List, Optional, Dict, Any
 
-@dataclass
+@dataclass(frozen=True)
 class PortfolioPosition:
     ticker: str
     quantity: float
@@ -19,7 +20,7 @@ class PortfolioPosition:
     def from_dict(data: Dict[str, Any]) -> 'PortfolioPosition':
         return PortfolioPosition(**data)
 
-@dataclass
+@dataclass(frozen=True)
 class PortfolioOrder:
     # Snapshot of an active order at time X
     ticker: str
@@ -37,6 +38,35 @@ class PortfolioOrder:
     def from_dict(data: Dict[str, Any]) -> 'PortfolioOrder':
         return PortfolioOrder(**data)
 
+# DataFrame columns (dataclass field order) and row extractors
+_POSITION_COLS = tuple(f.name for f in fields(PortfolioPosition))
+_POSITION_ROW = attrgetter(*_POSITION_COLS)
+_ORDER_COLS = tuple(f.name for f in fields(PortfolioOrder))
+_ORDER_ROW = attrgetter(*_ORDER_COLS)
+
+class _VersionedList(list):
+    """list that counts its in-place changes (PortfolioSnapshot checks it before reusing derived views)."""
+    __slots__ = ("version",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def __reduce__(self):
+        return (_VersionedList, (list(self),))
+
+def _bump_version(name: str):
+    base = getattr(list, name)
+    def method(self, *args, **kwargs):
+        self.version += 1
+        return base(self, *args, **kwargs)
+    method.__name__ = name
+    return method
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_VersionedList, _name, _bump_version(_name))
+
 @dataclass
 class PortfolioSnapshot:
     timestamp: datetime
@@ -48,21 +78,62 @@ class PortfolioSnapshot:
     # Metadata
     source: str = "LIVE" # or "HISTORY"
 
+    # Derived views (DataFrames, lookup dicts): name -> (source list, its version, value).
+    # Rebuilt if the list was replaced or changed in place; the elements themselves are frozen.
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any):
+        # positions / active_orders are kept as _VersionedList (a copy of the given list)
+        if name in ("positions", "active_orders") and not isinstance(value, _VersionedList):
+            value = _VersionedList(value)
+        object.__setattr__(self, name, value)
+
+    def _cached(self, name: str, items: List[Any], build):
+        hit = self._derived.get(name)
+        if hit is not None and hit[0] is items and hit[1] == items.version:
+            return hit[2]
+        value = build(items)
+        self._derived[name] = (items, items.version, value)
+        return value
+
+    def _cached_df(self, name: str, items: List[Any], row, cols):
+        def build(items):
+            import pandas as pd
+            # One row tuple per object via attrgetter; empty input still yields the columns
+            return pd.DataFrame.from_records(list(map(row, items)), columns=cols)
+        return self._cached(name, items, build)
+
+    @property
+    def positions_by_ticker(self) -> Dict[str, PortfolioPosition]:
+        """Ticker -> position (first one if a ticker appears twice). Shared, do not mutate."""
+        def build(items):
+            index = {}
+            for p in items:
+                index.setdefault(p.ticker, p)
+            return index
+        return self._cached("positions_by_ticker", self.positions, build)
+
+    def position_of(self, ticker: str) -> Optional[PortfolioPosition]:
+        return self.positions_by_ticker.get(ticker)
+
+    def orders_of(self, ticker: str) -> List[PortfolioOrder]:
+        """Active orders for ticker (in snapshot order)."""
+        def build(items):
+            index: Dict[str, List[PortfolioOrder]] = {}
+            for o in items:
+                index.setdefault(o.ticker, []).append(o)
+            return index
+        return list(self._cached("orders_by_ticker", self.active_orders, build).get(ticker, ()))
+
     @property
     def positions_df(self):
-        """Returns positions as a Pandas DataFrame."""
-        import pandas as pd
-        if not self.positions:
-            return pd.DataFrame(columns=["ticker", "quantity", "avg_price", "current_price", "market_value", "unrealized_pnl"])
-        return pd.DataFrame([p.to_dict() for p in self.positions])
+        """Returns positions as a Pandas DataFrame (built once, shared: .copy() before mutating)."""
+        return self._cached_df("positions", self.positions, _POSITION_ROW, _POSITION_COLS)
 
     @property
     def active_orders_df(self):
-        """Returns active orders as a Pandas DataFrame."""
-        import pandas as pd
-        if not self.active_orders:
-            return pd.DataFrame(columns=["ticker", "order_id", "action", "type", "qty", "price", "trade_id"])
-        return pd.DataFrame([o.to_dict() for o in self.active_orders])
+        """Returns active orders as a Pandas DataFrame (built once, shared: .copy() before mutating)."""
+        return self._cached_df("active_orders", self.active_orders, _ORDER_ROW, _ORDER_COLS)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -8,15 +8,50 @@ import uuid
 import time
 import shutil
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 
 from .models import TradeState, TradeMetrics, TradeStatus, TradeTransaction
 from .logic import TradeCalculator
 from .interface import IBrokerAdapter, BrokerUpdate, BarData
-from .models import TradeState, TradeMetrics, TradeStatus, TradeTransaction, TradeOrderLog
+from .models import TradeState, TradeMetrics, TradeStatus, TradeTransaction, TradeOrderLog, dumps_trade, dumps_json, load_trade_dict
 from py_market_data import ChartManager
 
+# Append-only event journal next to the JSON snapshot ({id}.json -> {id}.events.jsonl)
+JOURNAL_SUFFIX = ".events.jsonl"
+
+def journal_path(filepath: str) -> str:
+    """Returns the journal path belonging to a trade snapshot file."""
+    return filepath[:-len(".json")] + JOURNAL_SUFFIX if filepath.endswith(".json") else filepath + JOURNAL_SUFFIX
+
+def replay_journal(state: TradeState, filepath: str, since_seq: int = 0) -> Tuple[int, int]:
+    """
+    Applies all journal records newer than the snapshot (seq > since_seq).
+    Unreadable lines (a torn append after a crash) are skipped, later records still apply.
+    Returns (last_seq, number_of_records_in_journal).
+    """
+    last_seq = since_seq
+    records = 0
+    try:
+        with open(journal_path(filepath), 'r') as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records += 1
+                seq = delta.get("seq", 0)
+                if seq <= since_seq:
+                    continue # Already contained in snapshot
+                state.apply_delta(delta)
+                last_seq = seq
+    except FileNotFoundError:
+        pass
+    return last_seq, records
+
 class TradeObject:
+    # Journal records after which refresh() compacts into a full snapshot
+    MAX_JOURNAL_RECORDS = 50
+
     @classmethod
     def get_or_create(cls, ticker: str, broker: IBrokerAdapter, storage_dir: str = "./data/trades") -> 'TradeObject':
         """
@@ -26,22 +61,31 @@ class TradeObject:
         ticker = ticker.upper()
         ticker_dir = os.path.join(storage_dir, ticker)
         
-        latest_file = None
+        # Last activity per trade id: refresh() only appends to the journal,
+        # so the journal mtime counts as well as the snapshot mtime.
+        snapshot_mtimes: Dict[str, float] = {}
+        journal_mtimes: Dict[str, float] = {}
+        try:
+            entries = list(os.scandir(ticker_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            # We assume filename is ID.json (journal: ID.events.jsonl)
+            if entry.name.endswith(".json") and entry.is_file():
+                snapshot_mtimes[entry.name[:-len(".json")]] = entry.stat().st_mtime
+            elif entry.name.endswith(JOURNAL_SUFFIX) and entry.is_file():
+                journal_mtimes[entry.name[:-len(JOURNAL_SUFFIX)]] = entry.stat().st_mtime
+
+        trade_id = None
         latest_time = 0
+        for tid, mtime in snapshot_mtimes.items():
+            mtime = max(mtime, journal_mtimes.get(tid, 0))
+            if mtime > latest_time:
+                latest_time = mtime
+                trade_id = tid
         
-        if os.path.exists(ticker_dir):
-            for f in os.listdir(ticker_dir):
-                if f.endswith(".json"):
-                    fp = os.path.join(ticker_dir, f)
-                    mtime = os.path.getmtime(fp)
-                    if mtime > latest_time:
-                        latest_time = mtime
-                        latest_file = f
-        
-        if latest_file:
+        if trade_id:
             # Load existing
-            # We assume filename is ID.json
-            trade_id = latest_file.replace(".json", "")
             try:
                 obj = cls(ticker=ticker, id=trade_id, storage_dir=storage_dir)
                 obj.set_broker(broker)
@@ -62,10 +106,20 @@ class TradeObject:
         """
         F-TO-021: Reconstructs a TradeObject from a dictionary (TradeState).
         """
-        ticker = data.get("ticker", "UNKNOWN")
+        return cls.from_state(TradeState.from_dict(data), data.get("journal_seq", 0), storage_dir)
+
+    @classmethod
+    def from_state(cls, state: TradeState, journal_seq: int = 0, storage_dir: str = "./data/trades",
+                   journal_records: int = 0) -> 'TradeObject':
+        """
+        Wraps an already parsed TradeState (e.g. from a cache) in a TradeObject.
+        journal_seq / journal_records: as returned by replay_journal() for that state.
+        """
         # Create obj without ID to avoid constructor loading from file
-        obj = cls(ticker=ticker, id=None, storage_dir=storage_dir)
-        obj._state = TradeState.from_dict(data)
+        obj = cls(ticker=state.ticker, id=None, storage_dir=storage_dir)
+        obj._state = state
+        obj._journal_seq = journal_seq
+        obj._journal_records = journal_records
         # Manually set filepath if id available
         if obj._state.id:
             obj.filepath = os.path.join(obj.storage_dir, f"{obj.ticker}/{obj._state.id}.json")
@@ -78,6 +132,8 @@ class TradeObject:
         
         # 1. Initialize State
         self._state: Optional[TradeState] = None
+        self._journal_seq = 0      # Last journal sequence number applied/written
+        self._journal_records = 0  # Records currently in the journal file
         
         # Determine internal ID and Filepath
         if id:
@@ -134,37 +190,46 @@ class TradeObject:
             first_tx = self._state.transactions[0]
             initial_risk = abs(first_tx.price - self._state.initial_stop_price) * abs(first_tx.quantity)
 
-        return TradeCalculator.calculate_metrics(self._state.transactions, current_price, initial_risk)
+        return TradeCalculator.calculate_state_metrics(self._state, current_price, initial_risk)
 
-    def _ensure_chart(self, timeframe: str = "1D", lookback: str = "1Y"):
+    def _ensure_chart(self, timeframe: str = "1D", lookback: str = "1Y") -> Optional[Sequence[BarData]]:
         """
         Internal helper to sync chart data if broker is available.
+        Returns the synced bars, or None if no broker is injected.
         """
         if self.broker:
             # ChartManager needs an IMarketDataProvider. self.broker implements this.
             self.chart_manager.provider = self.broker
-            self.chart_manager.ensure_data(self.ticker, timeframe, lookback)
+            return self.chart_manager.ensure_data(self.ticker, timeframe, lookback)
+        return None
 
-    def get_chart(self, timeframe: str = "1D", lookback: str = "1Y") -> List[BarData]:
+    def get_chart(self, timeframe: str = "1D", lookback: str = "1Y") -> Sequence[BarData]:
         """
-        F-TO-060: Returns historical chart data.
+        F-TO-060: Returns historical chart data (columnar BarArray, indexable like a list).
         Syncs with broker if available.
         """
         try:
-            self._ensure_chart(timeframe, lookback)
+            bars = self._ensure_chart(timeframe, lookback)
+            if bars is not None:
+                # Already validated against the cache, no second pass needed
+                return bars
         except Exception:
             # Silently ignore sync errors during history replay
             pass
+        # No broker (or sync failed): read-only cache access
         return self.chart_manager.ensure_data(self.ticker, timeframe, lookback)
 
     def _load(self):
         """Loads state from JSON."""
         try:
-            with open(self.filepath, 'r') as f:
-                data = json.load(f)
-                self._state = TradeState.from_dict(data)
+            data = load_trade_dict(self.filepath)
+            self._state = TradeState.from_dict(data)
         except (json.JSONDecodeError, FileNotFoundError) as e:
             raise RuntimeError(f"Failed to load TradeObject {self.filepath}: {e}")
+        # Apply events appended since the last snapshot
+        self._journal_seq, self._journal_records = replay_journal(
+            self._state, self.filepath, data.get("journal_seq", 0)
+        )
 
     def save(self):
         """
@@ -173,13 +238,19 @@ class TradeObject:
         """
         if not self._state: return
 
-        # 1. Serialize
-        data = self._state.to_dict()
+        # 1. Serialize (journal_seq marks which journal records are contained)
+        payload = dumps_trade(self._state, self._journal_seq, indent=True)
         
         # 2. Write to Temp File
         tmp_path = self.filepath + ".tmp"
-        with open(tmp_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        try:
+            f = open(tmp_path, 'wb')
+        except FileNotFoundError:
+            # Ticker directory removed while the process runs: recreate it
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            f = open(tmp_path, 'wb')
+        with f:
+            f.write(payload)
             f.flush()
             os.fsync(f.fileno()) # Ensure write to disk
 
@@ -188,21 +259,65 @@ class TradeObject:
         for i in range(max_retries):
             try:
                 os.replace(tmp_path, self.filepath)
+                self._truncate_journal()
                 break
             except OSError:
                 # On Windows, os.replace fails if dest exists and is locked.
                 if i < max_retries - 1:
                     time.sleep(0.05 * (i + 1)) # Conditional backoff
                 else:
-                    # Final attempt: Remove dest then Rename (Python < 3.3 atomicity workaround behavior)
+                    # Final attempt: Rename, remove dest only if it is in the way
+                    # (Python < 3.3 atomicity workaround behavior, no extra stat call)
                     try:
-                        if os.path.exists(self.filepath):
+                        try:
+                            os.rename(tmp_path, self.filepath)
+                        except FileExistsError:
                             os.remove(self.filepath)
-                        os.rename(tmp_path, self.filepath)
+                            os.rename(tmp_path, self.filepath)
+                        self._truncate_journal()
                     except Exception as e:
                         print(f"CRITICAL: Failed to save TradeObject {self.id}: {e}")
                         # Leave tmp file for recovery
 
+    def _truncate_journal(self):
+        """Drops the journal once its records are contained in the snapshot."""
+        try:
+            os.remove(journal_path(self.filepath))
+        except FileNotFoundError:
+            pass
+        self._journal_records = 0
+
+    def _append_delta(self, transactions: List[TradeTransaction], order_logs: List[TradeOrderLog]):
+        """
+        Persists a small state change by appending one record to the journal
+        instead of rewriting the full snapshot. Falls back to save() if no
+        snapshot exists yet or the journal is due for compaction.
+        """
+        if self._journal_records >= self.MAX_JOURNAL_RECORDS or not os.path.exists(self.filepath):
+            self.save()
+            return
+
+        self._journal_seq += 1
+        record = {
+            "seq": self._journal_seq,
+            "header": self._state.header_dict(),
+            "transactions": [t.to_dict() for t in transactions],
+            "order_history": [o.to_dict() for o in order_logs]
+        }
+        payload = dumps_json(record) + b"\n"
+
+        fd = os.open(journal_path(self.filepath), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # A crash mid-append leaves a torn last line: start on a fresh line
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                payload = b"\n" + payload
+            os.write(fd, payload)
+            os.fsync(fd) # Ensure write to disk
+        finally:
+            os.close(fd)
+        self._journal_records += 1
+
     # --- API COMMANDS (F-TO-030 bis F-TO-072) ---
 
     def _log_order(self, oid: str, quantity: float, limit: Optional[float], stop: Optional[float], note: str):
@@ -400,15 +515,25 @@ class TradeObject:
 
         # 2. Process New Fills
         # 2. Process New Fills & Log Executions
-        existing_ids = {t.id for t in self._state.transactions}
+        state = self._state
+        order_history = state.order_history
+        n_log_before = len(order_history)
+        existing_ids = {t.id for t in state.transactions}
         filled_order_ids = set() # Track orders that got fills in this update
+        new_fills: List[TradeTransaction] = []
+
+        # One timestamp per refresh: all events share poll-time semantics
+        now = datetime.now()
+        append_tx = state.append_transaction
+        append_log = order_history.append
         
         for fill in updates.new_fills:
             # Check if we already have this fill (Idempotency)
             if fill.id not in existing_ids:
                 # Calculate Slippage (F-TO-130) handled in logic/models if we pass trigger price
                 # For now, just append
-                self._state.transactions.append(fill)
+                append_tx(fill)
+                new_fills.append(fill)
                 existing_ids.add(fill.id)
                 state_changed = True
                 
@@ -416,20 +541,9 @@ class TradeObject:
                 if fill.order_id:
                     filled_order_ids.add(fill.order_id)
                     
-                    # Determine Status (simple heuristic due to lack of order quantity context)
-                    fill_status = "FILLED" 
-                    fill_msg = f"Filled {fill.quantity} @ {fill.price}"
-
-                    self._state.order_history.append(TradeOrderLog(
-                        timestamp=datetime.now(),
-                        order_id=fill.order_id,
-                        action="BUY" if fill.quantity > 0 else "SELL",
-                        status=fill_status,
-                        message=fill_msg,
-                        quantity=fill.quantity,
-                        type="FILL",
-                        limit_price=fill.price,
-                        stop_price=None
+                    # Status is always FILLED (simple heuristic due to lack of order quantity context)
+                    append_log(TradeOrderLog.fill_event(
+                        fill.order_id, fill.quantity, fill.price, now
                     ))
                     # Update status of the last log entry for this ID to FILLED?
                     # TradeOrderLog is an append-only event stream. 
@@ -459,8 +573,8 @@ class TradeObject:
                      # If NOT, it was likely CANCELLED or Rejected.
                      if oid not in filled_order_ids:
                          # Log CANCELLATION
-                         self._state.order_history.append(TradeOrderLog(
-                            timestamp=datetime.now(),
+                         append_log(TradeOrderLog(
+                            timestamp=now,
                             order_id=oid,
                             action="CANCEL", # Action is technically referencing the original order action but here acts as Event Type
                             status="CANCELLED",
@@ -474,7 +588,7 @@ class TradeObject:
         # 4. Update Status Logic (F-TO-120)
         # Re-calculate net quantity to check if we are OPEN or CLOSED
         # Pass current_price to calc metrics for status decision? Not strictly needed for Qty.
-        metrics = TradeCalculator.calculate_metrics(self._state.transactions, current_price)
+        metrics = TradeCalculator.calculate_state_metrics(state, current_price, now=now)
         
         # Transition Logic
         if self._state.status == TradeStatus.OPENING and metrics.net_quantity != 0:
@@ -488,7 +602,8 @@ class TradeObject:
                 state_changed = True
 
         if state_changed:
-            self.save()
+            # Only appends + header changes happened: journal the delta
+            self._append_delta(new_fills, order_history[n_log_before:])
 
     def get_event_stream(self) -> List[Dict[str, Any]]:
         """
@@ -57,11 +57,37 @@ class IMarketDataProvider(ABC):
         """
         pass
 
+    def get_historical_data_batch(self, symbols: List[str], timeframe: str, lookback: str) -> Dict[str, List[BarData]]:
+        """
+        Historical OHLCV for several symbols in one (concurrent) request.
+        Default: one get_historical_data() per symbol. Symbols whose fetch fails are omitted.
+        """
+        result = {}
+        for symbol in symbols:
+            try:
+                result[symbol] = self.get_historical_data(symbol, timeframe, lookback)
+            except Exception:
+                pass
+        return result
+
     @abstractmethod
     def get_current_price(self, symbol: str) -> float:
         """Fetches latest known price (Snapshot)."""
         pass
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Fetches latest known prices for several symbols in one request.
+        Default: one get_current_price() per symbol. Symbols that cannot be priced are omitted.
+        """
+        prices = {}
+        for symbol in symbols:
+            try:
+                prices[symbol] = self.get_current_price(symbol)
+            except Exception:
+                pass
+        return prices
+
 # --- The Union Interface (Optional, for backward compatibility) ---
 class IBrokerAdapter(IExecutionProvider, IMarketDataProvider):
     """Full broker capabilities."""
@@ -79,4 +105,18 @@ class IBrokerAdapter(IExecutionProvider, IMarketDataProvider):
     @abstractmethod
     def get_all_open_orders(self) -> List[Any]:
         """Returns list of open orders (adapter specific)."""
-        pass
\ No newline at end of file
+        pass
+
+    def get_positions_for(self, symbol: str) -> List[Any]:
+        """
+        Positions of one symbol. Adapters with a scoped request should override;
+        default: full get_positions() filtered by contract.symbol.
+        """
+        return [p for p in self.get_positions() if p.contract.symbol == symbol]
+
+    def get_open_orders_for(self, symbol: str) -> List[Any]:
+        """
+        Open orders of one symbol. Adapters with a scoped request should override;
+        default: full get_all_open_orders() filtered by contract.symbol.
+        """
+        return [t for t in self.get_all_open_orders() if t.contract.symbol == symbol]
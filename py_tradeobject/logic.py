@@ -2,102 +2,192 @@
 py_tradeobject/logic.py
 Business Rules & Calculations. PURE FUNCTIONS.
 """
-from typing import List, Optional
+import math
+from typing import List, Optional, Tuple
 from datetime import datetime
-from .models import TradeTransaction, TradeMetrics
+from .models import TradeTransaction, TradeMetrics, TradeState
+
+try:
+    # Optional JIT for the position replay kernel
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Accumulator of the position replay: (net_qty, avg_price, realized_pnl)
+_INIT_ACC = (0.0, 0.0, 0.0)
+# Residual quantity treated as flat after a closing fill
+_QTY_EPS = 5e-9
+
+def _fold_txs(acc: Tuple[float, float, float], qty_arr: List[float], price_arr: List[float],
+              start: int = 0) -> Tuple[float, float, float]:
+    """
+    Weighted-average position replay over time-sorted (quantity, price) columns,
+    continuing from `acc` at index `start` (left fold, so it can run incrementally).
+    Scalar float state only (no objects), so the loop stays a tight numeric kernel.
+    Returns the new accumulator (net_qty, avg_price, realized_pnl).
+    """
+    net_qty, avg_price, realized_pnl = acc
+
+    for i in range(start, len(qty_arr)):
+        qty = qty_arr[i]
+        price = price_arr[i]
+        # abs() once per iteration, reused by all branches
+        abs_qty = -qty if qty < 0.0 else qty
+        abs_net = -net_qty if net_qty < 0.0 else net_qty
+
+        # qty is signed (+ for Long Buy, - for Long Sell/Short Sell)
+        if net_qty * qty >= 0.0:
+            # OPEN / ASCENDING / BUILDING (flat or same direction)
+            # Weighted Average Price: (OldVal + NewVal) / NewQty
+            # Note: Using abs values allows valid math for both Long and Short averaging
+            # (opening from flat takes the price as is, no divide round-trip)
+            total_value = (abs_net * avg_price) + (abs_qty * price)
+            net_qty += qty
+            avg_price = total_value / (abs_net + abs_qty) if abs_net != 0.0 else price
+
+        else:
+            # REDUCING / CLOSING / FLIPPING (Opposite Direction)
+            # For Long (net>0, tx<0):  PnL = (SellPrice - AvgPrice) * QtyClosed
+            # For Short (net<0, tx>0): PnL = (AvgPrice - BuyPrice) * QtyClosed (inverted logic)
+            # -> one form: sign(net_qty) * (price - avg_price) * qty_closed
+            # A flip (Long 10 -> Sell 20 -> Short 10) closes the full position first.
+            qty_closed = abs_qty if abs_qty <= abs_net else abs_net
+            realized_pnl += math.copysign(1.0, net_qty) * (price - avg_price) * qty_closed
+
+            new_qty = net_qty + qty
+            if new_qty * net_qty < 0.0:
+                # FLIP: remainder opens the opposite side, new basis is execution price
+                avg_price = price
+            elif -_QTY_EPS <= new_qty <= _QTY_EPS:
+                # Closed to 0 (same threshold as round(net_qty, 8) == 0): reset to be clean
+                new_qty = 0.0
+                avg_price = 0.0
+            net_qty = new_qty
+
+    return net_qty, avg_price, realized_pnl
+
+if njit is not None:
+    _fold_txs_jit = njit(cache=True)(_fold_txs)
+else:
+    _fold_txs_jit = None
+
+def _replay(acc: Tuple[float, float, float], qty_arr, price_arr, start: int = 0) -> Tuple[float, float, float]:
+    """_fold_txs over whole columns: compiled when numba is installed, interpreted otherwise."""
+    if _fold_txs_jit is None or start >= len(qty_arr):
+        return _fold_txs(acc, qty_arr, price_arr, start)
+    import numpy as np
+    # Float64 views (zero-copy for the array('d') columns of TradeState)
+    return _fold_txs_jit(
+        tuple(float(x) for x in acc),
+        np.asarray(qty_arr, dtype=np.float64),
+        np.asarray(price_arr, dtype=np.float64),
+        start
+    )
+
+# Streaming accumulator: (net_qty, avg_price, realized_pnl, total_commissions, first_tx_time, last_tx_time)
+INIT_FOLD = (0.0, 0.0, 0.0, 0.0, None, None)
+
+def fold_step(acc: Tuple, t: TradeTransaction) -> Tuple:
+    """
+    Consumes one transaction (in timestamp order), for producers that receive
+    fills one at a time: reduce(fold_step, txs, INIT_FOLD), then
+    TradeCalculator.metrics_from_fold(). Same kernel as calculate_metrics.
+    """
+    net_qty, avg_price, realized_pnl = _fold_txs(acc[:3], (t.quantity,), (t.price,))
+    return (net_qty, avg_price, realized_pnl, acc[3] + t.commission, acc[4] or t.timestamp, t.timestamp)
 
 class TradeCalculator:
     """Pure logic class for deriving metrics and status."""
     
     @staticmethod
-    def calculate_metrics(transactions: List[TradeTransaction], current_price: float, initial_risk: float = 0.0) -> TradeMetrics:
+    def calculate_metrics(transactions: List[TradeTransaction], current_price: float, initial_risk: float = 0.0,
+                          *, now: Optional[datetime] = None) -> TradeMetrics:
         """
         Derives all metrics using Weighted Average Price logic.
         
         Algorithm:
-        1. Sort transactions by timestamp.
+        1. Sort transactions by timestamp (skipped when already sorted, which
+           TradeState.append_transaction guarantees; checked in O(n)).
         2. Iterate through transactions to rebuild position state.
            - Same Sign (Building): Update Avg Price.
            - Different Sign (Reducing): Calc Realized PnL, Keep Avg Price.
            - Flip (Long -> Short): Close old PnL, Start new Avg Price.
+
+        now: Reference clock for days_held of open positions. Callers evaluating
+        many trades per tick should take it once and pass it to every call.
         """
-        # Sortiere sicherheitshalber nach Zeit (auch wenn das TradeObjects selbst machen sollte)
-        sorted_tx = sorted(transactions, key=lambda t: t.timestamp)
+        # Re-Sort nur wenn nötig: TradeState liefert bereits sortiert, andere Aufrufer evtl. nicht
+        if any(transactions[i].timestamp > transactions[i + 1].timestamp for i in range(len(transactions) - 1)):
+            transactions = sorted(transactions, key=lambda t: t.timestamp)
         
-        net_qty = 0.0
-        avg_price = 0.0
-        realized_pnl = 0.0
+        # 0. Commission always accumulates
         total_commissions = 0.0
-        first_entry_time = None
-        last_tx_time = None
-        
-        for t in sorted_tx:
-            # 0. Commission always accumulates
+        for t in transactions:
             total_commissions += t.commission
-            
-            if not first_entry_time:
-                first_entry_time = t.timestamp
-            last_tx_time = t.timestamp
 
-            # 1. Determine Position Impact
-            # t.quantity is signed (+ for Long Buy, - for Long Sell/Short Sell)
-            
-            if net_qty == 0:
-                # OPEN NEW POSITION (or Flip to new side)
-                net_qty = t.quantity
-                avg_price = t.price
-            
-            elif (net_qty > 0 and t.quantity > 0) or (net_qty < 0 and t.quantity < 0):
-                # ASCENDING / BUILDING (Same Direction)
-                # Weighted Average Price: (OldVal + NewVal) / NewQty
-                # Note: Using abs() allows valid math for both Long and Short averaging
-                total_value = (abs(net_qty) * avg_price) + (abs(t.quantity) * t.price)
-                net_qty += t.quantity
-                avg_price = total_value / abs(net_qty)
-                
-            else:
-                # REDUCING / CLOSING / FLIPPING (Opposite Direction)
-                
-                # Case A: Partial/Full Closing
-                if abs(t.quantity) <= abs(net_qty):
-                    # Realize PnL on closed portion
-                    # For Long (net>0, tx<0):  PnL = (SellPrice - AvgPrice) * QtySold
-                    # For Short (net<0, tx>0): PnL = (AvgPrice - BuyPrice) * QtyBought (inverted logic)
-                    
-                    qty_closed = abs(t.quantity)
-                    
-                    if net_qty > 0: # Long Closing
-                        trade_pnl = (t.price - avg_price) * qty_closed
-                    else: # Short Closing
-                        trade_pnl = (avg_price - t.price) * qty_closed
-                    
-                    realized_pnl += trade_pnl
-                    net_qty += t.quantity # Reduces magnitude
-                    
-                    # If position closed exactly to 0, reset avg_price just to be clean
-                    if round(net_qty, 8) == 0:
-                        net_qty = 0.0
-                        avg_price = 0.0
-                        
-                # Case B: FLIP (Close full + Open new opposite)
-                # Example: Long 10 -> Sell 20 -> Short 10
-                else:
-                    # 1. Close current fully
-                    qty_closed = abs(net_qty)
-                    if net_qty > 0: # Long Closing
-                        trade_pnl = (t.price - avg_price) * qty_closed
-                    else: # Short Closing
-                        trade_pnl = (avg_price - t.price) * qty_closed
-                    
-                    realized_pnl += trade_pnl
-                    
-                    # 2. Open remainder as new position
-                    # Remaining is simply the sum, as signs are opposite
-                    # e.g. +10 (Long) + -20 (Sell) = -10 (New Short)
-                    remaining_qty = net_qty + t.quantity
-                    net_qty = remaining_qty
-                    avg_price = t.price # New basis is execution price
-        
+        # 1. Position replay on plain float columns
+        net_qty, avg_price, realized_pnl = _replay(
+            _INIT_ACC,
+            [t.quantity for t in transactions],
+            [t.price for t in transactions]
+        )
+
+        return TradeCalculator._finalize(
+            net_qty, avg_price, realized_pnl, total_commissions,
+            transactions[0].timestamp if transactions else None,
+            transactions[-1].timestamp if transactions else None,
+            current_price,
+            initial_risk,
+            now
+        )
+
+    @staticmethod
+    def calculate_state_metrics(state: TradeState, current_price: float, initial_risk: float = 0.0,
+                                *, now: Optional[datetime] = None) -> TradeMetrics:
+        """
+        Same as calculate_metrics, but consumes the columnar mirror of the
+        (time-sorted) TradeState directly instead of re-walking the objects.
+        """
+        qty, price, comm = state.columns()
+        txs = state.transactions
+
+        # Incremental: only fold transactions added since the last call.
+        # Any non-append mutation bumps state._version and forces a full replay.
+        cache = state._metrics_cache
+        if cache.get("version") != state._version or cache.get("n_processed", 0) > len(qty):
+            cache.clear()
+            cache.update(version=state._version, n_processed=0, acc=_INIT_ACC, commissions=0.0)
+
+        start = cache["n_processed"]
+        if start < len(qty):
+            cache["acc"] = _replay(cache["acc"], qty, price, start)
+            cache["commissions"] = sum(comm[start:], cache["commissions"])
+            cache["n_processed"] = len(qty)
+
+        net_qty, avg_price, realized_pnl = cache["acc"]
+        return TradeCalculator._finalize(
+            net_qty, avg_price, realized_pnl, cache["commissions"],
+            txs[0].timestamp if txs else None,
+            txs[-1].timestamp if txs else None,
+            current_price,
+            initial_risk,
+            now
+        )
+
+    @staticmethod
+    def metrics_from_fold(acc: Tuple, current_price: float, initial_risk: float = 0.0,
+                          *, now: Optional[datetime] = None) -> TradeMetrics:
+        """Finalizes a fold_step() accumulator with the current price."""
+        return TradeCalculator._finalize(*acc, current_price, initial_risk, now)
+
+    @staticmethod
+    def _finalize(net_qty: float, avg_price: float, realized_pnl: float, total_commissions: float,
+                  first_entry_time: Optional[datetime], last_tx_time: Optional[datetime],
+                  current_price: float, initial_risk: float, now: Optional[datetime] = None) -> TradeMetrics:
+        """
+        Price/time dependent tail of the metric calculation (O(1)).
+        Consumes the replay accumulator produced by _fold_txs.
+        """
         # Final Calculations
         unrealized_pnl = 0.0
         if net_qty != 0:
@@ -105,7 +195,7 @@ class TradeCalculator:
                 unrealized_pnl = (current_price - avg_price) * abs(net_qty)
             else:
                 unrealized_pnl = (avg_price - current_price) * abs(net_qty)
-        
+
         # R-Multiple
         r_multiple = 0.0
         if initial_risk and initial_risk != 0:
@@ -120,7 +210,8 @@ class TradeCalculator:
                 end_date = last_tx_time
             else:
                 # Use current time, ensuring timezone compatibility
-                now = datetime.now()
+                if now is None:
+                    now = datetime.now()
                 end_date = now.astimezone() if first_entry_time.tzinfo else now
             
             # Safety: Ensure both are compatible regarding timezone
@@ -166,3 +257,21 @@ class TradeCalculator:
         else:
             # Selling: Lower execution is BAD
             return execution_price - trigger_price
+
+    @staticmethod
+    def calculate_slippage_batch(trigger_prices, execution_prices, quantities):
+        """
+        Vectorized calculate_slippage for many fills at once (e.g. backfilling
+        historical transactions). Accepts sequences or arrays; None triggers
+        are treated as 'no trigger' (0.0 slippage). Returns a numpy float64 array.
+        """
+        import numpy as np
+
+        trigger = np.asarray(trigger_prices, dtype=np.float64) # None -> NaN
+        exec_price = np.asarray(execution_prices, dtype=np.float64)
+        qty = np.asarray(quantities, dtype=np.float64)
+
+        valid = np.isfinite(trigger) & (trigger > 0)
+        # Buying: Higher execution is BAD, Selling: Lower execution is BAD
+        sign = np.where(qty > 0, 1.0, -1.0)
+        return np.where(valid, sign * (trigger - exec_price), 0.0)
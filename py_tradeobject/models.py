@@ -2,10 +2,22 @@
 py_tradeobject/models.py
 Core Data Structures (DTOs/Enums). PURE DATA.
 """
+import json
+import mmap
+import os
 from enum import Enum
+from types import MappingProxyType
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+
+try:
+    # Optional C parser for ISO timestamps (restore of long histories)
+    from ciso8601 import parse_datetime as _parse_dt
+except ImportError:
+    _parse_dt = datetime.fromisoformat
 
 class TradeStatus(Enum):
     PLANNED = "PLANNED"   # No position, setup phase
@@ -20,7 +32,24 @@ class TransactionType(Enum):
     EXIT = "EXIT"
     ADJUSTMENT = "ADJUSTMENT"
 
-@dataclass
+# Value -> member maps: a dict lookup is much cheaper than Enum(value) in bulk loads.
+# The other direction uses member._value_ (plain attribute) instead of the .value descriptor.
+_STATUS_MAP = {m.value: m for m in TradeStatus}
+_TXN_TYPE_MAP = {m.value: m for m in TransactionType}
+
+def _status_of(value) -> TradeStatus:
+    """Dict hit for known values; anything else goes through the enum (same ValueError as before)."""
+    status = _STATUS_MAP.get(value)
+    return status if status is not None else TradeStatus(value)
+
+def _txn_type_of(value) -> TransactionType:
+    tx_type = _TXN_TYPE_MAP.get(value)
+    return tx_type if tx_type is not None else TransactionType(value)
+
+# Shared read-only stand-in for empty TradeOrderLog.details
+_EMPTY = MappingProxyType({})
+
+@dataclass(slots=True)
 class TradeOrderLog:
     """
     Historical record of an order submission.
@@ -37,7 +66,12 @@ class TradeOrderLog:
     stop_price: Optional[float]
     trigger_price: Optional[float] = None # For Stop Orders (auxPrice)
     note: str = ""      # e.g. "Initial Entry", "Stop Trail", "Scale Out"
-    details: Dict[str, Any] = field(default_factory=dict) # [NEW] Extra details
+    details: Optional[Dict[str, Any]] = None # [NEW] Extra details (None = empty, no dict per record)
+
+    @property
+    def details_dict(self) -> Dict[str, Any]:
+        """Read-only view of details, never None."""
+        return self.details or _EMPTY
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -52,13 +86,34 @@ class TradeOrderLog:
             "stop_price": self.stop_price,
             "trigger_price": self.trigger_price,
             "note": self.note,
-            "details": self.details
+            "details": self.details or {}
         }
 
+    @classmethod
+    def fill_event(cls, order_id: str, quantity: float, price: float, timestamp: datetime) -> 'TradeOrderLog':
+        """
+        Fast factory for FILLED events (refresh() hot path).
+        Bypasses the dataclass __init__ kwarg handling.
+        """
+        log = object.__new__(cls)
+        log.timestamp = timestamp
+        log.order_id = order_id
+        log.action = "BUY" if quantity > 0 else "SELL"
+        log.status = "FILLED"
+        log.message = f"Filled {quantity} @ {price}"
+        log.quantity = quantity
+        log.type = "FILL"
+        log.limit_price = price
+        log.stop_price = None
+        log.trigger_price = None
+        log.note = ""
+        log.details = None
+        return log
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'TradeOrderLog':
         return TradeOrderLog(
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=_parse_dt(data["timestamp"]),
             order_id=data["order_id"],
             action=data["action"],
             status=data.get("status", "UNKNOWN"),
@@ -69,10 +124,10 @@ class TradeOrderLog:
             stop_price=data.get("stop_price"),
             trigger_price=data.get("trigger_price"),
             note=data.get("note", ""),
-            details=data.get("details", {})
+            details=data.get("details") or None
         )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeTransaction:
     """Immutable record of an executed order."""
     id: str             # Broker Execution ID
@@ -88,7 +143,7 @@ class TradeTransaction:
         return {
             "id": self.id,
             "timestamp": self.timestamp.isoformat(),
-            "type": self.type.value,
+            "type": self.type._value_,
             "quantity": self.quantity,
             "price": self.price,
             "commission": self.commission,
@@ -100,8 +155,8 @@ class TradeTransaction:
     def from_dict(data: Dict[str, Any]) -> 'TradeTransaction':
         return TradeTransaction(
             id=data["id"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            type=TransactionType(data["type"]),
+            timestamp=_parse_dt(data["timestamp"]),
+            type=_txn_type_of(data["type"]),
             quantity=data["quantity"],
             price=data["price"],
             commission=data["commission"],
@@ -109,7 +164,7 @@ class TradeTransaction:
             order_id=data.get("order_id")
         )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeMetrics:
     """Calculated intrinsic metrics for a trade."""
     net_quantity: float = 0.0
@@ -128,13 +183,13 @@ class TradeMetrics:
     def from_dict(data: Dict[str, Any]) -> 'TradeMetrics':
         return TradeMetrics(**data)
     
-@dataclass
+@dataclass(slots=True)
 class TradeState:
     """The full serializable state of a trade object."""
     id: str             # [F-TO-140] order_ref
     ticker: str
     status: TradeStatus # [F-TO-120]
-    transactions: List[TradeTransaction] = field(default_factory=list)
+    transactions: List[TradeTransaction] = field(default_factory=list) # Sorted by timestamp, add via append_transaction()
     active_orders: Dict[str, str] = field(default_factory=dict) # {broker_oid: 'ENTRY'|'STOP'|'EXIT'} [F-TO-120]
     
     # NEU: Das vollständige Order-Tagebuch
@@ -146,13 +201,55 @@ class TradeState:
     entry_date: Optional[datetime] = None
     notes: str = ""
 
+    # Columnar mirror of transactions (quantity, price, commission) as contiguous doubles.
+    # Maintained by append_transaction(), rebuilt lazily if the list was mutated directly.
+    _qty: array = field(default_factory=lambda: array('d'), init=False, repr=False, compare=False)
+    _price: array = field(default_factory=lambda: array('d'), init=False, repr=False, compare=False)
+    _comm: array = field(default_factory=lambda: array('d'), init=False, repr=False, compare=False)
+    _columns_valid: bool = field(default=True, init=False, repr=False, compare=False)
+    # Bumped on any non-append mutation; invalidates the incremental metrics cache
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _metrics_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def append_transaction(self, t: TradeTransaction):
+        """
+        Adds a transaction, keeping the list sorted by timestamp.
+        Common case (newest fill) is an O(1) append to list and columns.
+        """
+        txs = self.transactions
+        if not txs or t.timestamp >= txs[-1].timestamp:
+            if self._columns_valid and len(self._qty) == len(txs):
+                self._qty.append(t.quantity)
+                self._price.append(t.price)
+                self._comm.append(t.commission)
+            else:
+                self._columns_valid = False
+            txs.append(t)
+        else:
+            # Out-of-order fill: insert in place, columns are rebuilt on next access
+            idx = bisect_right([x.timestamp for x in txs], t.timestamp)
+            txs.insert(idx, t)
+            self._columns_valid = False
+            self._version += 1
+
+    def columns(self) -> Tuple[array, array, array]:
+        """Returns (quantity, price, commission) columns in transaction order."""
+        if not self._columns_valid or len(self._qty) != len(self.transactions):
+            txs = self.transactions
+            self._qty = array('d', [t.quantity for t in txs])
+            self._price = array('d', [t.price for t in txs])
+            self._comm = array('d', [t.commission for t in txs])
+            self._columns_valid = True
+            self._version += 1 # List may have been mutated directly
+        return self._qty, self._price, self._comm
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "ticker": self.ticker,
-            "status": self.status.value,
-            "transactions": [t.to_dict() for t in self.transactions],
-            "order_history": [o.to_dict() for o in self.order_history],
+            "status": self.status._value_,
+            "transactions": list(map(TradeTransaction.to_dict, self.transactions)),
+            "order_history": list(map(TradeOrderLog.to_dict, self.order_history)),
             "active_orders": self.active_orders,
             "initial_stop_price": self.initial_stop_price,
             "current_stop_price": self.current_stop_price,
@@ -160,16 +257,105 @@ class TradeState:
             "notes": self.notes
         }
 
+    def transaction_arrays(self) -> Dict[str, Any]:
+        """
+        Transactions as parallel numpy arrays (columnar export, e.g. for np.savez_compressed).
+        order_id None is stored as "" so no object arrays (pickle) are needed.
+        """
+        import numpy as np
+
+        txs = self.transactions
+        qty, price, comm = self.columns()
+        return {
+            "id": np.array([t.id for t in txs], dtype=str),
+            "timestamp": np.array([t.timestamp for t in txs], dtype="datetime64[us]"),
+            "type": np.array([t.type._value_ for t in txs], dtype=str),
+            "quantity": np.frombuffer(qty, dtype=np.float64).copy(),
+            "price": np.frombuffer(price, dtype=np.float64).copy(),
+            "commission": np.frombuffer(comm, dtype=np.float64).copy(),
+            "slippage": np.array([t.slippage for t in txs], dtype=np.float64),
+            "order_id": np.array([t.order_id or "" for t in txs], dtype=str),
+        }
+
+    @staticmethod
+    def transactions_from_arrays(arrays: Dict[str, Any]) -> List[TradeTransaction]:
+        """Inverse of transaction_arrays() (accepts the mapping returned by np.load)."""
+        return [
+            TradeTransaction(
+                id=str(tx_id), timestamp=ts, type=_txn_type_of(str(tx_type)),
+                quantity=q, price=p, commission=c, slippage=sl, order_id=str(oid) or None
+            )
+            for tx_id, ts, tx_type, q, p, c, sl, oid in zip(
+                arrays["id"], arrays["timestamp"].astype(object), arrays["type"],
+                arrays["quantity"].tolist(), arrays["price"].tolist(),
+                arrays["commission"].tolist(), arrays["slippage"].tolist(), arrays["order_id"]
+            )
+        ]
+
+    def closed_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Denormalized result of a CLOSED/ARCHIVED trade (None otherwise), JSON-ready.
+        Written next to the state on save so readers need not replay the transactions.
+        """
+        if self.status not in (TradeStatus.CLOSED, TradeStatus.ARCHIVED) or not self.transactions:
+            return None
+        sorted_tx = sorted(self.transactions, key=lambda x: x.timestamp)
+        entry_tx = sorted_tx[0]
+        last_tx = sorted_tx[-1]
+
+        # Cash Flow = -(Qty * Price) - Commission
+        pnl = 0.0
+        total_bought_qty = 0.0
+        for tx in sorted_tx:
+            pnl += -(tx.quantity * tx.price) - tx.commission
+            if tx.quantity > 0:
+                total_bought_qty += tx.quantity
+
+        return {
+            "entry_ts": entry_tx.timestamp.isoformat(),
+            "close_ts": last_tx.timestamp.isoformat(),
+            "entry_price": entry_tx.price,
+            "exit_price": last_tx.price,
+            "qty": total_bought_qty,
+            "pnl_absolute": pnl,
+            "duration_days": (last_tx.timestamp - entry_tx.timestamp).days
+        }
+
+    def header_dict(self) -> Dict[str, Any]:
+        """Small, frequently mutated part of the state (status, orders, stops)."""
+        return {
+            "status": self.status._value_,
+            "active_orders": self.active_orders,
+            "initial_stop_price": self.initial_stop_price,
+            "current_stop_price": self.current_stop_price
+        }
+
+    def apply_delta(self, delta: Dict[str, Any]):
+        """Replays one journal record (header overwrite + appended events)."""
+        header = delta.get("header")
+        if header:
+            self.status = _status_of(header["status"])
+            self.active_orders = header.get("active_orders", {})
+            self.initial_stop_price = header.get("initial_stop_price")
+            self.current_stop_price = header.get("current_stop_price")
+        for t in delta.get("transactions", []):
+            self.append_transaction(TradeTransaction.from_dict(t))
+        self.order_history.extend(TradeOrderLog.from_dict(o) for o in delta.get("order_history", []))
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'TradeState':
         state = TradeState(
             id=data["id"],
             ticker=data["ticker"],
-            status=TradeStatus(data["status"]),
+            status=_status_of(data["status"]),
         )
         
         if "transactions" in data:
-            state.transactions = [TradeTransaction.from_dict(t) for t in data["transactions"]]
+            state.transactions = sorted(
+                (TradeTransaction.from_dict(t) for t in data["transactions"]),
+                key=lambda t: t.timestamp
+            )
+            state.columns() # Build columnar mirror in one pass
             
         if "order_history" in data:
             state.order_history = [TradeOrderLog.from_dict(o) for o in data["order_history"]]
@@ -180,7 +366,72 @@ class TradeState:
         state.initial_stop_price = data.get("initial_stop_price")
         state.current_stop_price = data.get("current_stop_price")
         if data.get("entry_date"):
-            state.entry_date = datetime.fromisoformat(data["entry_date"])
+            state.entry_date = _parse_dt(data["entry_date"])
         state.notes = data.get("notes", "")
             
         return state
+
+# --- Trade file I/O (orjson C codec when installed, stdlib json otherwise) ---
+
+# Trade files at least this large are parsed from an mmap instead of a read() copy
+_MMAP_MIN_BYTES = 1 << 20
+
+def dumps_trade(state: TradeState, journal_seq: int = 0, indent: bool = False) -> bytes:
+    """
+    Encodes the persisted trade document as UTF-8 JSON:
+    to_dict() + journal_seq (+ summary, see closed_summary(), once the trade is closed).
+    """
+    data = state.to_dict()
+    data["journal_seq"] = journal_seq
+    summary = state.closed_summary()
+    if summary is not None:
+        data["summary"] = summary
+    return dumps_json(data, indent)
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Encodes plain JSON data (dicts, lists, str, numbers) as UTF-8 bytes."""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2 if indent else None).encode("utf-8")
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+def dump_trade(state: TradeState, path: str, journal_seq: int = 0):
+    """Writes a trade file (no atomic replace, see TradeObject.save() for that)."""
+    with open(path, "wb") as f:
+        f.write(dumps_trade(state, journal_seq))
+
+def load_trade_dict(path: str, size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Reads a trade file as raw dict (keeps journal_seq). Raises json.JSONDecodeError on bad JSON.
+    `size` (e.g. from a scandir stat) saves the fstat. Small files: one os.read();
+    large files are parsed straight from a read-only mmap (no copy into a bytes object).
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if size is None:
+            size = os.fstat(fd).st_size
+        if size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as raw:
+                    return loads_json(raw)
+        raw = os.read(fd, size + 1) # +1: notice a file that grew since the stat
+        while len(raw) > size:
+            more = os.read(fd, 65536)
+            if not more:
+                break
+            raw += more
+        return loads_json(raw)
+    finally:
+        os.close(fd)
+
+def loads_json(raw) -> Any:
+    """Parses JSON bytes / memoryview. Raises json.JSONDecodeError on bad JSON."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(bytes(raw))
+    return orjson.loads(raw) # orjson.JSONDecodeError subclasses json.JSONDecodeError
+
+def load_trade(path: str) -> TradeState:
+    return TradeState.from_dict(load_trade_dict(path))
@@ -1,5 +1,9 @@
 # tests/integration_full_cycle.py
 import subprocess
+import codecs
+import collections
+import select
+import threading
 import time
 import json
 import sys
@@ -11,8 +15,34 @@ TIMEOUT = 30  # Seconds to wait for responses
 TICKER = "INTC"
 LIMIT_PRICE = 10.0 # Way below market to stay pending
 QUANTITY = 10
+CWD = os.getcwd()
+CHART_PATH = os.path.join(CWD, "data/market_cache", TICKER, "charts/1D.json") # Auto-downloaded on trade entry
+READ_CHUNK = 65536 # Bytes per os.read() on the child's stdout
+
+# Historical scenario: days before now for Order A submit, A cancel / B submit, B fill
+OFFSETS = (10, 5, 2)
+# `history N` probes: between START and MID (A active), between MID and END (B active), now (none)
+HISTORY_PROBES = (7, 3, 0)
+PRETTY_FIXTURES = os.environ.get("STOCK_LOGGER_PRETTY_FIXTURES") == "1"
+DEBUG = bool(os.environ.get("STOCK_LOGGER_TEST_DEBUG")) # Echo raw CLI output
+
+# Child stdout is read in blocks; complete lines are consumed from this buffer
+_stdout_buf = ""
+_stdout_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+_json_decoder = json.JSONDecoder()
+# Tail of the child's stderr (drained by a background thread) for crash reports
+_stderr_tail = collections.deque(maxlen=200)
 
 # --- Helper for Historical Scenario ---
+# Order log fields not given explicitly by a scenario entry
+_ORDER_DEFAULTS = dict(message="", quantity=10, type="LMT", limit_price=None, stop_price=None,
+                       trigger_price=None, note="")
+
+def _mk_order(ts, oid, action, status, **overrides):
+    """One serialized TradeOrderLog entry (timestamp as isoformat string)."""
+    return {"timestamp": ts, "order_id": oid, "action": action, "status": status,
+            **_ORDER_DEFAULTS, **overrides, "details": {}}
+
 def create_historical_scenarios():
     """Creates a dummy trade file with historical order logs."""
     history_ticker = "HIST_ORDER_TEST"
@@ -22,9 +52,8 @@ def create_historical_scenarios():
     # Dates
     from datetime import datetime, timedelta
     now = datetime.now()
-    t_start = now - timedelta(days=10)
-    t_mid = now - timedelta(days=5)
-    t_end = now - timedelta(days=2)
+    t_start, t_mid, t_end = (now - timedelta(days=d) for d in OFFSETS)
+    s_start, s_mid, s_end = (t.isoformat() for t in (t_start, t_mid, t_end))
     
     # Trade State with Order History:
     # 1. Order A (Submitted @ t_start) -> Cancelled @ t_mid
@@ -37,7 +66,7 @@ def create_historical_scenarios():
         "transactions": [
             {
                "id": "TX_B",
-               "timestamp": t_end.isoformat(),
+               "timestamp": s_end,
                "type": "ENTRY",
                "quantity": 10,
                "price": 100.0,
@@ -48,68 +77,27 @@ def create_historical_scenarios():
         "active_orders": {}, # Currently no active orders
         "order_history": [
             # Order A: Submitted then Cancelled
-            {
-                "timestamp": t_start.isoformat(),
-                "order_id": "ORD_A",
-                "action": "BUY",
-                "status": "SUBMITTED",
-                "message": "Entry A",
-                "quantity": 10,
-                "type": "LMT",
-                "limit_price": 99.0,
-                "stop_price": None,
-                "trigger_price": None,
-                "note": "Initial A",
-                "details": {}
-            },
-            {
-                "timestamp": t_mid.isoformat(),
-                "order_id": "ORD_A",
-                "action": "CANCEL",
-                "status": "CANCELLED",
-                "message": "Cancelled A",
-                "quantity": 0,
-                "type": "CANCEL",
-                "limit_price": None,
-                "stop_price": None,
-                "trigger_price": None,
-                "note": "",
-                "details": {}
-            },
+            _mk_order(s_start, "ORD_A", "BUY", "SUBMITTED", message="Entry A", limit_price=99.0, note="Initial A"),
+            _mk_order(s_mid, "ORD_A", "CANCEL", "CANCELLED", message="Cancelled A", quantity=0, type="CANCEL"),
             # Order B: Submitted then Filled
-            {
-                "timestamp": t_mid.isoformat(),
-                "order_id": "ORD_B",
-                "action": "BUY",
-                "status": "SUBMITTED",
-                "message": "Entry B",
-                "quantity": 10,
-                "type": "LMT",
-                "limit_price": 100.0,
-                "stop_price": None,
-                "trigger_price": None,
-                "note": "Entry B",
-                "details": {}
-            },
-            {
-                "timestamp": t_end.isoformat(),
-                "order_id": "ORD_B",
-                "action": "BUY",
-                "status": "FILLED",
-                "message": "Filled B",
-                "quantity": 10,
-                "type": "FILL",
-                "limit_price": 100.0,
-                "stop_price": None,
-                "trigger_price": None,
-                "note": "",
-                "details": {}
-            }
+            _mk_order(s_mid, "ORD_B", "BUY", "SUBMITTED", message="Entry B", limit_price=100.0, note="Entry B"),
+            _mk_order(s_end, "ORD_B", "BUY", "FILLED", message="Filled B", type="FILL", limit_price=100.0),
         ]
     }
     
-    with open(f"{trade_dir}/hist_trade.json", "w") as f:
-        json.dump(state, f, indent=2)
+    # Machine-read only: compact JSON unless STOCK_LOGGER_PRETTY_FIXTURES=1
+    path = f"{trade_dir}/hist_trade.json"
+    if PRETTY_FIXTURES:
+        with open(path, "w") as f:
+            json.dump(state, f, indent=2)
+    else:
+        try:
+            import orjson
+            payload = orjson.dumps(state)
+        except ImportError:
+            payload = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(payload)
         
     print(f"✅ Created historical scenario: {history_ticker}")
     return t_start, t_mid, t_end
@@ -121,17 +109,19 @@ def run_test():
     print(f"🚀 Launching {RUN_PAPER_SCRIPT}...")
     
     # Start Process
-    # We need universal_newlines=True to handle strings instead of bytes
-    # buffering=1 for line buffering
+    # Binary pipes: commands are written to the raw stdin fd (_send_command),
+    # stdout is read block-wise from the raw fd (_read_chunk), not via readline().
     process = subprocess.Popen(
         [sys.executable, "-u", RUN_PAPER_SCRIPT, "--client-id", "556"],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        cwd=os.getcwd()
+        stderr=subprocess.PIPE, # Kept off stdout so only CLI output reaches the JSON parser
+        text=False,
+        bufsize=65536,
+        cwd=CWD
     )
+    os.set_blocking(process.stdout.fileno(), False)
+    threading.Thread(target=_drain_stderr, args=(process,), daemon=True).start()
     
     try:
         # 1. Wait for Startup
@@ -155,51 +145,55 @@ def run_test():
         # Actually T_Start=Now-10. T_Mid=Now-5.
         # Check at 7 days back.
         
-        print("\n🔎 Verifying History @ 7 Days Ago (Expect Order A Active)...")
-        _send_command(process, "history 7")
-        resp = _read_json_response(process)
-        if notCB(resp): raise RuntimeError(f"History 7 failed: {resp}")
+        # All probes are pipelined in one write; the CLI answers stdin lines in FIFO order.
+        probe_a, probe_b, _ = HISTORY_PROBES
+        _send_commands(process, [f"history {d}" for d in HISTORY_PROBES])
+        probe_resps = [_read_json_response(process) for _ in HISTORY_PROBES]
+        for d, resp in zip(HISTORY_PROBES, probe_resps):
+            if resp.get("success") is not True: raise RuntimeError(f"History {d} failed: {resp}")
+
+        print(f"\n🔎 Verifying History @ {probe_a} Days Ago (Expect Order A Active)...")
+        resp = probe_resps[0]
         
         active_orders = resp["payload"].get("active_orders", [])
-        # Provide logic to find 'ORD_A'
-        found_a = any(o["order_id"] == "ORD_A" for o in active_orders)
-        found_b = any(o["order_id"] == "ORD_B" for o in active_orders)
+        ids = {o.get("order_id") for o in active_orders}
+        found_a = "ORD_A" in ids
+        found_b = "ORD_B" in ids
         
         if not found_a:
              print(f"DEBUG FULL RESP: {json.dumps(resp, indent=2)}")
-             raise AssertionError("Order A should be active 7 days ago!")
+             raise AssertionError(f"Order A should be active {probe_a} days ago!")
         if found_b:
-             raise AssertionError("Order B should NOT be active 7 days ago!")
+             raise AssertionError(f"Order B should NOT be active {probe_a} days ago!")
         print("✅ Order A correctly identified as active in history.")
 
         # Point 2: 3 days ago (Between MID and END) -> Order B Active? Order A Cancelled?
         # T_Mid was -5. T_End is -2.
         # Check at 3 days back.
-        print("\n🔎 Verifying History @ 3 Days Ago (Expect Order B Active, A Gone)...")
-        _send_command(process, "history 3")
-        resp = _read_json_response(process)
-        if notCB(resp): raise RuntimeError(f"History 3 failed: {resp}")
+        print(f"\n🔎 Verifying History @ {probe_b} Days Ago (Expect Order B Active, A Gone)...")
+        resp = probe_resps[1]
         
         active_orders = resp["payload"].get("active_orders", [])
-        found_a = any(o["order_id"] == "ORD_A" for o in active_orders)
-        found_b = any(o["order_id"] == "ORD_B" for o in active_orders)
+        ids = {o.get("order_id") for o in active_orders}
+        found_a = "ORD_A" in ids
+        found_b = "ORD_B" in ids
         
         if found_a:
-             raise AssertionError("Order A should be CANCELLED 3 days ago!")
+             raise AssertionError(f"Order A should be CANCELLED {probe_b} days ago!")
         if not found_b:
              print(f"Payload: {active_orders}")
-             raise AssertionError("Order B should be active 3 days ago!")
+             raise AssertionError(f"Order B should be active {probe_b} days ago!")
         print("✅ Order B correctly identified as active (A gone).")
 
         # Point 3: 0 days ago (Now) -> No active orders (B filled)
         print("\n🔎 Verifying History @ Now (Expect No Active Orders)...")
-        _send_command(process, "history 0")
-        resp = _read_json_response(process)
+        resp = probe_resps[2]
         
         active_orders = resp["payload"].get("active_orders", [])
+        ids = {o.get("order_id") for o in active_orders}
         if active_orders:
              # Check if they are OUR test orders
-             if any(o["order_id"] in ["ORD_A", "ORD_B"] for o in active_orders):
+             if "ORD_A" in ids or "ORD_B" in ids:
                  raise AssertionError(f"Orders A/B should be closed! Found: {active_orders}")
         print("✅ Orders correctly closed in present time.")
              
@@ -216,7 +210,7 @@ def run_test():
         _send_command(process, f"trade {cmd}")
         
         resp = _read_json_response(process)
-        if notCB(resp):
+        if resp.get("success") is not True:
              print(f"❌ Trade Enter Failed: {resp}")
              sys.exit(1)
              
@@ -224,8 +218,10 @@ def run_test():
         order_id = resp["payload"]["broker_order_id"]
         print(f"✅ Trade Entered. ID: {trade_id}, Order: {order_id}")
         
-        # 4. Wait a bit (simulate bot thinking)
-        time.sleep(2)
+        # 4. No fixed wait: place_order blocks until the broker has the order,
+        #    so the ENTER response itself is the completion signal.
+        if resp["payload"].get("status") != "OPENING":
+             raise RuntimeError(f"Entry order not submitted: {resp}")
         
         # 5. Cancel Trade
         cmd = json.dumps({
@@ -237,7 +233,7 @@ def run_test():
         _send_command(process, f"trade {cmd}")
         
         resp = _read_json_response(process)
-        if notCB(resp):
+        if resp.get("success") is not True:
              print(f"❌ Trade Cancel Failed: {resp}")
              sys.exit(1)
              
@@ -245,10 +241,9 @@ def run_test():
         print(f"✅ Trade Cancelled.")
         
         # --- NEW: Verify Chart Download ---
-        chart_path = os.path.join(os.getcwd(), "data/market_cache/INTC/charts/1D.json")
-        print(f"Checking for chart file at: {chart_path}")
-        if not os.path.exists(chart_path):
-             raise RuntimeError(f"Chart file not found at {chart_path}. Auto-download failed?")
+        print(f"Checking for chart file at: {CHART_PATH}")
+        if not os.path.isfile(CHART_PATH):
+             raise RuntimeError(f"Chart file not found at {CHART_PATH}. Auto-download failed?")
         print("✅ Chart file found (Auto-Download Verified).")
         
         # --- NEW: Verify History Command ---
@@ -256,7 +251,7 @@ def run_test():
         _send_command(process, "history 0") 
         resp = _read_json_response(process)
         
-        if notCB(resp):
+        if resp.get("success") is not True:
              raise RuntimeError(f"History command failed: {resp}")
         
         print(f"✅ History Command Response: {resp.get('message')}")
@@ -277,20 +272,59 @@ def run_test():
         except subprocess.TimeoutExpired:
             process.kill()
 
+def _drain_stderr(process):
+    """Forwards the child's stderr (tracebacks, logging) and keeps its tail."""
+    for raw in process.stderr:
+        line = raw.decode("utf-8", errors="replace")
+        _stderr_tail.append(line)
+        sys.stderr.write(line)
+
+def _read_chunk(process, timeout):
+    """
+    Waits up to `timeout` for child output and appends one block (up to READ_CHUNK bytes)
+    to _stdout_buf. Returns False on EOF.
+    """
+    global _stdout_buf
+    fd = process.stdout.fileno()
+    ready, _, _ = select.select([fd], [], [], timeout)
+    if not ready:
+        return True
+    try:
+        chunk = os.read(fd, READ_CHUNK)
+    except BlockingIOError:
+        return True
+    if not chunk:
+        return False
+    _stdout_buf += _stdout_decoder.decode(chunk)
+    return True
+
+def _next_line():
+    """Pops one complete line from _stdout_buf, or None if there is none yet."""
+    global _stdout_buf
+    pos = _stdout_buf.find("\n")
+    if pos < 0:
+        return None
+    line = _stdout_buf[:pos + 1]
+    _stdout_buf = _stdout_buf[pos + 1:]
+    return line
+
 def _wait_for_output(process, content, timeout):
-    start = time.time()
+    deadline = time.monotonic() + timeout
     buffer = ""
-    while time.time() - start < timeout:
-        # Read line by line non-blocking is tricky with standard read/readline
-        # But stdout is PIPE. readline() blocks until newline.
-        line = process.stdout.readline()
-        if not line:
-            if process.poll() is not None:
+    while True:
+        line = _next_line()
+        if line is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not _read_chunk(process, remaining):
                 raise RuntimeError("Process exited unexpectedly.")
             continue
             
         buffer += line
-        print(f"[RunPaper] {line.strip()}") 
+        if DEBUG:
+            sys.stdout.write("[RunPaper] ")
+            sys.stdout.write(line)
         
         if content in line:
             return True
@@ -298,43 +332,65 @@ def _wait_for_output(process, content, timeout):
     raise TimeoutError(f"Did not find '{content}' in output within {timeout}s.\nBuffer:\n{buffer}")
 
 def _send_command(process, cmd):
-    print(f"Sending: {cmd}")
-    process.stdin.write(cmd + "\n")
-    process.stdin.flush()
+    _send_commands(process, [cmd])
+
+def _send_commands(process, cmds):
+    """Writes several command lines in one go (responses come back in the same order)."""
+    for cmd in cmds:
+        print(f"Sending: {cmd}")
+    payload = "".join(cmd + "\n" for cmd in cmds).encode("utf-8")
+    fd = process.stdin.fileno()
+    while payload: # Unbuffered: no TextIOWrapper encode + flush
+        payload = payload[os.write(fd, payload):]
+
+def _is_partial(err, buf):
+    """True if a decode error only means the JSON value has not been fully received yet."""
+    if err.msg.startswith("Unterminated string"):
+        return "\n" not in buf[err.pos:] # JSON strings cannot span lines
+    return err.pos >= len(buf.rstrip())
+
+def _echo(text):
+    if not DEBUG:
+        return
+    for line in text.splitlines(keepends=True):
+        if line.strip():
+            sys.stdout.write("[RunPaper] ")
+            sys.stdout.write(line if line.endswith("\n") else line + "\n")
 
-def _read_json_response(process):
+def _read_json_response(process, timeout=60):
     # We expect the next line (or one of the next lines) to be valid JSON
     # The CLI might print prompts or other info.
-    # We scan for '{'
-    
-    start = time.time()
-    while time.time() - start < 60:
-        line = process.stdout.readline()
-        if not line:
-            if process.poll() is not None:
-                # Process dead. Read stderr for clues
-                err = process.stderr.read()
-                raise RuntimeError(f"Process exited. STDERR:\n{err}")
-            continue
-            
-        line = line.strip()
-        # Find JSON boundaries
-        if "{" in line and "}" in line:
+    # We scan the read buffer for '{' and let raw_decode parse one value from there
+    # (also handles indented multi-line JSON and log lines with stray braces).
+    global _stdout_buf
+    deadline = time.monotonic() + timeout
+    pos = 0 # Scan position in _stdout_buf
+    while True:
+        idx = _stdout_buf.find("{", pos)
+        if idx >= 0:
             try:
-                start = line.index("{")
-                end = line.rindex("}") + 1
-                json_part = line[start:end]
-                return json.loads(json_part)
-            except:
-                print(f"[RunPaper] {line}")
+                obj, end = _json_decoder.raw_decode(_stdout_buf, idx)
+            except json.JSONDecodeError as e:
+                if not _is_partial(e, _stdout_buf):
+                    pos = idx + 1 # Not JSON, keep scanning
+                    continue
+            else:
+                _echo(_stdout_buf[:idx])
+                _stdout_buf = _stdout_buf[end:]
+                return obj
         else:
-            if line:
-                print(f"[RunPaper] {line}")
+            pos = len(_stdout_buf)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not _read_chunk(process, remaining):
+            # Process dead. Stderr tail for clues
+            process.wait(timeout=5)
+            err = "".join(_stderr_tail)
+            raise RuntimeError(f"Process exited. STDERR:\n{err}")
                 
     raise TimeoutError("No JSON response received.")
 
-def notCB(resp):
-    return resp.get("success") is not True
-
 if __name__ == "__main__":
     run_test()
@@ -54,6 +54,21 @@ def test_snapshot_analyzer():
     assert abs(p.risk_pct - 5.26) < 0.1
     assert p.heat_warning == True # > 2.5%
 
+    # DataFrames are built once per snapshot and rebuilt when the list changes
+    assert snap.positions_df is snap.positions_df
+    snap.positions.append(pos)
+    assert len(snap.positions_df) == 2
+    # Replacing an element in place is seen too; the elements themselves are frozen
+    from dataclasses import FrozenInstanceError, replace
+    snap.positions[1] = replace(pos, ticker="BBB")
+    assert snap.positions_df["ticker"].tolist() == ["AAA", "BBB"]
+    assert snap.position_of("BBB") is snap.positions[1]
+    try:
+        pos.quantity = 0.0
+        assert False, "PortfolioPosition must be immutable"
+    except FrozenInstanceError:
+        pass
+
 def test_series_analyzer():
     # Series: 10k -> 11k -> 9k -> 12k
     s1 = PortfolioSnapshot(datetime(2025,1,1), 10000, 10000, [], [], "TEST")
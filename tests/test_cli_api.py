@@ -3,48 +3,46 @@ import sys
 import os
 import json
 # import pytest
-from unittest.mock import MagicMock
+from unittest.mock import create_autospec, patch
 
 # Adjust path to find modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from py_cli.controller import CLIController
 from py_cli.models import CLIMode
-from py_cli.commands import ICommand, registry
 import py_cli.handlers_execution
 import py_cli.handlers_monitor
 import py_cli.handlers_user_mode
 # Wir benötigen KEINEN Broker, da wir Mocks nutzen oder den Service Locator manipulieren
 
 from py_captrader import services
-from py_tradeobject.interface import IBrokerAdapter
-from py_portfolio_state.objects import PortfolioSnapshot
+from py_tradeobject.interface import IBrokerAdapter, BrokerUpdate
+from py_portfolio_state.live import LivePortfolioManager
 
 # --- Mocks ---
-class MockBroker(IBrokerAdapter):
-    # Abstract methods from IBrokerAdapter
-    def get_account_summary(self): return {"NetLiquidation": 50000.0}
-    def get_positions(self): return []
-    def get_all_open_orders(self): return []
-    def get_current_price(self, symbol): return 100.0
-    def place_order(self, *args, **kwargs): return "MOCK_OID"
-    def cancel_order(self, *args): return True
-    def get_updates(self, *args): 
-        from py_tradeobject.interface import BrokerUpdate
-        return BrokerUpdate([], [], [])
-    def get_historical_data(self, *args): return []
+# Built once: autospec'd IBrokerAdapter (signature-checked stubs, no hand-written subclass)
+_BROKER_SPEC = create_autospec(IBrokerAdapter, instance=True)
+_BROKER_SPEC.get_account_summary.return_value = {"NetLiquidation": 50000.0}
+_BROKER_SPEC.get_positions.return_value = []
+_BROKER_SPEC.get_all_open_orders.return_value = []
+_BROKER_SPEC.get_current_price.return_value = 100.0
+_BROKER_SPEC.get_current_prices.return_value = {}
+_BROKER_SPEC.place_order.return_value = "MOCK_OID"
+_BROKER_SPEC.cancel_order.return_value = True
+_BROKER_SPEC.get_updates.return_value = BrokerUpdate([], [], [])
+_BROKER_SPEC.get_historical_data.return_value = []
 
 # --- Contexts ---
-def get_bot_controller():
-    # Register Mock Broker
-    services.register_broker(MockBroker())
-    return CLIController(mode=CLIMode.BOT)
+def get_controller(mode: CLIMode = CLIMode.BOT):
+    # Every controller shares the one Mock Broker spec
+    services.register_broker(_BROKER_SPEC)
+    return CLIController(mode=mode)
 
 # --- Tests ---
 
 def test_user_mode_switching():
     print("Testing User Mode Switching...")
-    cli = get_bot_controller()
+    cli = get_controller()
     
     # 2. Switch to Human
     resp_text = cli.process_input("user human")
@@ -61,16 +59,25 @@ def test_user_mode_switching():
     assert resp2["payload"]["mode"] == "BOT"
     print("✅ User Mode Switching Passed.")
 
-def test_status_command_bot():
-    print("Testing Status Command (BOT)...")
-    cli = get_bot_controller()
-    resp_json = cli.process_input("status")
-    resp = json.loads(resp_json)
-    
-    assert resp["success"] is True
-    assert resp["payload"]["equity"] == 50000.0
-    assert resp["message"] == "Live Portfolio Snapshot"
-    print("✅ Status Command (BOT) Passed.")
+def test_status_command():
+    # Same command, both renderers (BOT -> JSON, HUMAN -> text)
+    for mode in (CLIMode.BOT, CLIMode.HUMAN):
+        print(f"Testing Status Command ({mode.value})...")
+        cli = get_controller(mode)
+        # The handler persists the snapshot: keep ./data/portfolio_latest.json out of the repo
+        with patch.object(LivePortfolioManager, "save_snapshot") as save_snapshot:
+            output = cli.process_input("status")
+        assert save_snapshot.call_count == 1
+        
+        if mode == CLIMode.BOT:
+            resp = json.loads(output)
+            assert resp["success"] is True
+            assert resp["payload"]["equity"] == 50000.0
+            assert resp["message"] == "Live Portfolio Snapshot"
+        else:
+            assert "✅ Live Portfolio Snapshot" in output
+            assert '"equity": 50000.0' in output
+        print(f"✅ Status Command ({mode.value}) Passed.")
 
 # def test_trade_command_bot(cli_controller):
 #     # TODO: Implement handlers_trade.py first
@@ -79,7 +86,7 @@ def test_status_command_bot():
 if __name__ == "__main__":
     try:
         test_user_mode_switching()
-        test_status_command_bot()
+        test_status_command()
         print("\n[SUCCESS] CLI API Verification PASSED")
     except Exception as e:
         print(f"\n[FAILURE] CLI API Verification FAILED: {e}")
@@ -1,4 +1,6 @@
 
+import numpy as np
+
 from py_financial_math.risk import calculate_position_size, calculate_risk_exposure, calculate_heat
 from py_financial_math.series import calculate_drawdown_series, calculate_series_metrics
 from py_financial_math.performance import calculate_trade_metrics
@@ -29,20 +31,29 @@ def test_heat():
 def test_drawdown_series():
     # Curve: 100 -> 110 -> 99 -> 120
     # DD:    0%  -> 0%  -> (110-99)/110=10% -> 0%
-    curve = [100.0, 110.0, 99.0, 120.0]
+    curve = np.array([100.0, 110.0, 99.0, 120.0], dtype=np.float64)
     dds = calculate_drawdown_series(curve)
     assert len(dds) == 4
     assert dds[0] == 0.0
     assert dds[1] == 0.0
     assert abs(dds[2] - 0.1) < 0.0001
     assert dds[3] == 0.0
+    assert calculate_drawdown_series(curve.tolist()) == dds
+
+    # Long random walk vs. the scalar high-watermark loop
+    walk = np.cumsum(np.random.default_rng(7).standard_normal(10_000)) + 1000
+    peak, expected = walk[0], []
+    for val in walk.tolist():
+        peak = max(peak, val)
+        expected.append((peak - val) / peak)
+    assert calculate_drawdown_series(walk) == expected
 
 def test_series_metrics():
     # Curve: 100 -> 110 -> 121 (10% gains)
     # Total Return: 21%
     # CAGR (252 periods/year): huge because only 3 days.
     # Let's test basic calculation
-    curve = [100.0, 110.0, 121.0]
+    curve = np.array([100.0, 110.0, 121.0], dtype=np.float64)
     m = calculate_series_metrics(curve, periods_per_year=252)
     assert abs(m.total_return_pct - 0.21) < 0.0001
     assert m.max_drawdown_pct == 0.0
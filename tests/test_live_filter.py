@@ -1,29 +1,25 @@
 # import pytest
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from py_portfolio_state.live import LivePortfolioManager
 from py_portfolio_state.objects import PortfolioSnapshot
 from py_tradeobject.interface import IBrokerAdapter
 
+# Plain namespaces: the manager only reads attributes (no MagicMock machinery needed)
 class MockPosition:
     def __init__(self, symbol, qty, avg_cost):
-        self.contract = MagicMock()
-        self.contract.symbol = symbol
+        self.contract = SimpleNamespace(symbol=symbol)
         self.position = qty
         self.avgCost = avg_cost
 
 class MockOrder:
     def __init__(self, symbol, order_id, action, qty, price, ref=""):
-        self.contract = MagicMock()
-        self.contract.symbol = symbol
-        self.order = MagicMock()
-        self.order.orderId = order_id
-        self.order.action = action
-        self.order.orderType = "LMT"
-        self.order.totalQuantity = qty
-        self.order.lmtPrice = price
-        self.order.auxPrice = 0.0
-        self.order.orderRef = ref
+        self.contract = SimpleNamespace(symbol=symbol)
+        self.order = SimpleNamespace(
+            orderId=order_id, action=action, orderType="LMT", totalQuantity=qty,
+            lmtPrice=price, auxPrice=0.0, orderRef=ref
+        )
 
 def test_live_portfolio_filter():
     # 1. Setup Mock Broker
@@ -37,28 +33,14 @@ def test_live_portfolio_filter():
     ]
     
     # 2 orders: AAPL and MSFT
-    trade_aapl = MagicMock()
-    trade_aapl.contract.symbol = "AAPL"
-    trade_aapl.order.orderId = 1
-    trade_aapl.order.action = "BUY"
-    trade_aapl.order.orderType = "LMT"
-    trade_aapl.order.totalQuantity = 5
-    trade_aapl.order.lmtPrice = 145.0
-    trade_aapl.order.auxPrice = 0.0
-    trade_aapl.order.orderRef = "TRD-1"
-
-    trade_msft = MagicMock()
-    trade_msft.contract.symbol = "MSFT"
-    trade_msft.order.orderId = 2
-    trade_msft.order.action = "SELL"
-    trade_msft.order.orderType = "LMT"
-    trade_msft.order.totalQuantity = 2
-    trade_msft.order.lmtPrice = 310.0
-    trade_msft.order.auxPrice = 0.0
-    trade_msft.order.orderRef = "TRD-2"
+    trade_aapl = MockOrder("AAPL", 1, "BUY", 5, 145.0, ref="TRD-1")
+    trade_msft = MockOrder("MSFT", 2, "SELL", 2, 310.0, ref="TRD-2")
 
     broker.get_all_open_orders.return_value = [trade_aapl, trade_msft]
-    broker.get_current_price.return_value = 160.0 # Standard price for all
+    # Spec'd mock: route the scoped calls through the interface defaults
+    broker.get_positions_for.side_effect = lambda s: IBrokerAdapter.get_positions_for(broker, s)
+    broker.get_open_orders_for.side_effect = lambda s: IBrokerAdapter.get_open_orders_for(broker, s)
+    broker.get_current_prices.side_effect = lambda symbols: {s: 160.0 for s in symbols} # Standard price for all
 
     manager = LivePortfolioManager(broker)
     # Mock save_snapshot to avoid file I/O
@@ -68,6 +50,11 @@ def test_live_portfolio_filter():
     snap_full = manager.snapshot()
     assert len(snap_full.positions) == 2
     assert len(snap_full.active_orders) == 2
+    # Prices fetched in one batch, not per position
+    assert broker.get_current_prices.call_count == 1
+    assert sorted(broker.get_current_prices.call_args[0][0]) == ["AAPL", "MSFT"]
+    assert broker.get_current_price.call_count == 0
+    assert snap_full.positions[0].current_price == 160.0
 
     # --- Test 2: AAPL Filter ---
     snap_aapl = manager.snapshot(ticker="AAPL")
@@ -75,6 +62,8 @@ def test_live_portfolio_filter():
     assert snap_aapl.positions[0].ticker == "AAPL"
     assert len(snap_aapl.active_orders) == 1
     assert snap_aapl.active_orders[0].ticker == "AAPL"
+    broker.get_positions_for.assert_called_with("AAPL")
+    broker.get_open_orders_for.assert_called_with("AAPL")
 
     # --- Test 3: MSFT Filter ---
     snap_msft = manager.snapshot(ticker="MSFT")
@@ -0,0 +1,95 @@
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Adjust path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from py_tradeobject.interface import BarData, IMarketDataProvider
+from py_market_data import BarArray, ChartManager, save_bars, load_bars, load_bar_array
+
+def _bar(day, close):
+    return BarData(datetime(2025, 1, 1) + timedelta(days=day), 1.0, 2.0, 0.5, close, 100.0)
+
+def test_bar_array_merge_last_write_wins():
+    existing = BarArray.from_bars([_bar(0, 10.0), _bar(1, 11.0), _bar(2, 12.0)])
+    incoming = BarArray.from_bars([_bar(3, 13.0), _bar(2, 99.0), _bar(3, 14.0)])
+    merged = existing.merge(incoming)
+    assert [b.close for b in merged] == [10.0, 11.0, 99.0, 14.0]
+    assert merged[-1] == _bar(3, 14.0)
+    assert [b.close for b in reversed(merged)] == [14.0, 99.0, 11.0, 10.0]
+    assert merged[1:3].to_list() == [_bar(1, 11.0), _bar(2, 99.0)]
+
+def test_storage_roundtrip_with_sidecar():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "TEST", "charts", "1D.json")
+        bars = [_bar(i, 100.0 + i / 3) for i in range(50)]
+        save_bars(path, bars)
+        assert os.path.exists(path + ".cols")
+        assert load_bars(path) == bars
+
+        # Stale / missing sidecar falls back to the JSON and is rebuilt
+        os.remove(path + ".cols")
+        assert load_bar_array(path) == bars
+        assert os.path.exists(path + ".cols")
+        assert not load_bar_array(path + ".missing")
+
+        # Chart directory removed while the process runs: the next save recreates it
+        import shutil
+        shutil.rmtree(os.path.join(root, "TEST"))
+        save_bars(path, bars)
+        assert load_bars(path) == bars
+
+def test_tz_aware_bars_keep_their_offset():
+    from datetime import timezone
+    est = timezone(timedelta(hours=-5))
+    bars = [BarData(datetime(2025, 1, 2, 9, 30, tzinfo=est) + timedelta(days=i), 1.0, 2.0, 0.5, 1.5, 10.0)
+            for i in range(3)]
+    naive = _bar(10, 5.0)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "TZ", "charts", "1H.json")
+        save_bars(path, bars)
+        with open(path) as f:
+            assert "2025-01-02T09:30:00-05:00" in f.read() # Same on-disk format as the BarData list
+        assert load_bar_array(path) == bars # Sidecar
+        os.remove(path + ".cols")
+        for loaded in (load_bar_array(path), load_bar_array(path)): # JSON fallback, then rebuilt sidecar
+            assert loaded[0].timestamp.isoformat() == "2025-01-02T09:30:00-05:00"
+            assert loaded == bars
+
+    merged = BarArray.from_bars([naive]).take([0]).concat(BarArray.from_bars(bars))
+    assert merged[0].timestamp.tzinfo is None
+    assert merged[1].timestamp.utcoffset() == timedelta(hours=-5)
+
+class CountingProvider(IMarketDataProvider):
+    def __init__(self):
+        self.batches = []
+
+    def get_historical_data(self, symbol, timeframe, lookback):
+        if symbol == "BAD":
+            raise ValueError("Unknown symbol")
+        return [_bar(0, 10.0), _bar(1, 11.0)]
+
+    def get_historical_data_batch(self, symbols, timeframe, lookback):
+        self.batches.append(list(symbols))
+        return super().get_historical_data_batch(symbols, timeframe, lookback)
+
+    def get_current_price(self, symbol):
+        return 0.0
+
+def test_ensure_data_many_single_batch():
+    with tempfile.TemporaryDirectory() as root:
+        provider = CountingProvider()
+        charts = ChartManager(storage_root=root, provider=provider).ensure_data_many(["AAA", "BBB", "BAD"], "1D")
+        assert provider.batches == [["AAA", "BBB", "BAD"]] # Empty caches share one lookback -> one request
+        assert charts["AAA"].to_list() == [_bar(0, 10.0), _bar(1, 11.0)]
+        assert not charts["BAD"]
+        # Persisted like ensure_data() (read-only manager sees the data)
+        assert ChartManager(storage_root=root).ensure_data("BBB", "1D") == charts["BBB"]
+
+if __name__ == "__main__":
+    test_bar_array_merge_last_write_wins()
+    test_storage_roundtrip_with_sidecar()
+    test_tz_aware_bars_keep_their_offset()
+    test_ensure_data_many_single_batch()
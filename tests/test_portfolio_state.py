@@ -1,10 +1,9 @@
 import sys
 import os
-import shutil
-import json
-from datetime import datetime, timedelta
+import tempfile
+from datetime import datetime
 from typing import List, Any, Dict
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 # Adjust path to find modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -12,8 +11,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from py_tradeobject.interface import IBrokerAdapter
 from py_portfolio_state.live import LivePortfolioManager
 from py_portfolio_state.history import HistoryFactory
-from py_portfolio_state.objects import PortfolioSnapshot, PortfolioPosition
-from py_tradeobject.models import TradeState, TradeStatus, TradeTransaction, TransactionType
+from py_tradeobject.models import TradeState, TradeStatus, TradeTransaction, TransactionType, dump_trade, load_trade_dict
 
 # --- Mocks ---
 
@@ -29,8 +27,7 @@ class MockBroker(IBrokerAdapter):
         # Mimic IBKR Position tuple behavior with a simple class or namedtuple
         class MockPos:
             def __init__(self, symbol, pos, avgCost):
-                self.contract = MagicMock()
-                self.contract.symbol = symbol
+                self.contract = SimpleNamespace(symbol=symbol)
                 self.position = pos
                 self.avgCost = avgCost
         
@@ -58,8 +55,7 @@ class MockBroker(IBrokerAdapter):
 
         class MockTrade:
             def __init__(self, symbol, orderId, action, orderType, qty, lmt=0.0, aux=0.0, ref=""):
-                self.contract = MagicMock()
-                self.contract.symbol = symbol
+                self.contract = SimpleNamespace(symbol=symbol)
                 self.order = MockOrder(orderId, action, orderType, qty, lmt, aux, ref)
 
         return [
@@ -77,8 +73,12 @@ def test_live_manager():
     print("\n--- Testing LivePortfolioManager ---")
     broker = MockBroker()
     manager = LivePortfolioManager(broker)
+    # Record instead of writing ./data/portfolio_latest.json into the repo
+    saved = []
+    manager.save_snapshot = saved.append
     
     snapshot = manager.snapshot()
+    assert saved == [snapshot]
     
     print(f"Snapshot Timestamp: {snapshot.timestamp}")
     print(f"Equity: {snapshot.equity} (Expected 75000.0)")
@@ -87,19 +87,20 @@ def test_live_manager():
     # 1. Positions
     assert len(snapshot.positions) == 2
     
-    aapl_pos = next(p for p in snapshot.positions if p.ticker == "AAPL")
+    aapl_pos = snapshot.position_of("AAPL")
     assert aapl_pos.quantity == 100
     assert aapl_pos.market_value == 16000.0
     
     # 2. Orders
     assert len(snapshot.active_orders) == 2
     
-    aapl_order = next(o for o in snapshot.active_orders if o.ticker == "AAPL")
+    aapl_order, = snapshot.orders_of("AAPL")
     assert aapl_order.qty == 10
     assert aapl_order.price == 155.0 # lmtPrice
     assert aapl_order.trade_id == "TRD-AAPL-1"
     
-    tsla_order = next(o for o in snapshot.active_orders if o.ticker == "TSLA")
+    tsla_order, = snapshot.orders_of("TSLA")
+    assert snapshot.position_of("TSLA") is None
     assert tsla_order.qty == 20
     assert tsla_order.price == 200.0 # auxPrice (Stop)
     assert tsla_order.trade_id == "TRD-TSLA-1"
@@ -108,10 +109,11 @@ def test_live_manager():
 
 def test_history_factory():
     print("\n--- Testing HistoryFactory ---")
-    test_dir = "./data/test_history_portfolio"
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    os.makedirs(test_dir)
+    # Scratch trades dir in the system temp location; removed by the context manager
+    with tempfile.TemporaryDirectory() as test_dir:
+        _check_history_factory(test_dir)
+
+def _check_history_factory(test_dir: str):
     
     # Create Dummy TradeState JSON in Ticker Subdir
     ticker = "GOOGL"
@@ -146,8 +148,7 @@ def test_history_factory():
         details={}
     ))
     
-    with open(os.path.join(ticker_dir, "TRD-001.json"), 'w') as f:
-        json.dump(ts.to_dict(), f)
+    dump_trade(ts, os.path.join(ticker_dir, "TRD-001.json"))
     
     factory = HistoryFactory(trades_dir=test_dir)
     factory.load_all_trades()
@@ -202,6 +203,10 @@ def test_history_factory():
     assert dailies[2].timestamp.day == 3
     assert dailies[2].positions[0].quantity == 20
 
+    # Sweep must agree with the point-in-time replay
+    for snap in dailies:
+        assert snap == factory.get_snapshot_at(snap.timestamp)
+
     # Test Closed Trade Aggregator (F-PS-080)
     print("Testing get_closed_trades...")
     # Add a CLOSED trade
@@ -218,8 +223,7 @@ def test_history_factory():
     ))
     
     # Save it
-    with open(os.path.join(test_dir, "MSFT_closed.json"), 'w') as f:
-        json.dump(ts_closed.to_dict(), f)
+    dump_trade(ts_closed, os.path.join(test_dir, "MSFT_closed.json"))
         
     # Reload factory to pick up new file
     factory.load_all_trades()
@@ -235,12 +239,64 @@ def test_history_factory():
     # PnL: (-10*200 -1) + (-(-10)*220 -1) = -2001 + 2199 = +198
     print(f"PnL: {result.pnl_absolute}")
     assert result.pnl_absolute == 198.0
+    # PnL is materialized into the file at write time
+    assert load_trade_dict(os.path.join(test_dir, "MSFT_closed.json"))["summary"]["pnl_absolute"] == 198.0
+    assert factory.get_closed_trades(datetime(2025, 1, 11), datetime(2025, 1, 31)) == []
+
+    # Second load comes from the mtime index; a rewritten file is re-parsed
+    assert os.path.exists(os.path.join(test_dir, ".cache", "index.pkl"))
+    factory.load_all_trades()
+    assert len(factory._cache) == 2
+    ts_closed.notes = "edited"
+    dump_trade(ts_closed, os.path.join(test_dir, "MSFT_closed.json"))
+    factory.load_all_trades()
+    assert any(t._state.notes == "edited" for t in factory._cache)
+
+    # A cached blob that no longer unpickles falls back to parsing the file
+    import pickle
+    index_path = os.path.join(test_dir, ".cache", "index.pkl")
+    with open(index_path, "rb") as f:
+        index = pickle.load(f)
+    for path, (signature, _) in index["files"].items():
+        index["files"][path] = (signature, b"not a pickle")
+    with open(index_path, "wb") as f:
+        pickle.dump(index, f)
+    factory.load_all_trades()
+    assert len(factory._cache) == 2
+    with open(index_path, "rb") as f:
+        assert all(blob != b"not a pickle" for _, blob in pickle.load(f)["files"].values())
+
+    # An index written by another version is discarded
+    index["version"] = -1
+    with open(index_path, "wb") as f:
+        pickle.dump(index, f)
+    factory.load_all_trades()
+    assert len(factory._cache) == 2
 
     print("History Factory Verification PASSED")
-    
-    # Cleanup
-    shutil.rmtree(test_dir)
+
+def test_history_factory_parallel_parse():
+    import py_portfolio_state.history as history
+    with tempfile.TemporaryDirectory() as test_dir:
+        for i in range(4):
+            ts = TradeState(id=f"TRD-P{i}", ticker="PAR", status=TradeStatus.OPEN)
+            ts.transactions.append(TradeTransaction(
+                id=f"P{i}", timestamp=datetime(2025, 1, 1 + i), type=TransactionType.ENTRY,
+                quantity=1, price=10.0, commission=0.0
+            ))
+            dump_trade(ts, os.path.join(test_dir, f"TRD-P{i}.json"))
+
+        # Force the (spawn) process pool for a small batch
+        old_min = history.PARALLEL_MIN_FILES
+        history.PARALLEL_MIN_FILES = 2
+        try:
+            factory = HistoryFactory(test_dir)
+            factory.load_all_trades()
+        finally:
+            history.PARALLEL_MIN_FILES = old_min
+        assert sorted(t.id for t in factory._cache) == [f"TRD-P{i}" for i in range(4)]
 
 if __name__ == "__main__":
     test_live_manager()
     test_history_factory()
+    test_history_factory_parallel_parse()
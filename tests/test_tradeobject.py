@@ -0,0 +1,225 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Adjust path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from py_tradeobject.core import TradeObject, journal_path
+from py_tradeobject.interface import BrokerUpdate
+from py_tradeobject.logic import TradeCalculator, fold_step, INIT_FOLD
+from py_tradeobject.models import TradeTransaction, TransactionType, TradeStatus, TradeState
+
+# --- Mocks ---
+
+class MockBroker:
+    """Only get_updates() is needed for refresh()."""
+    def __init__(self):
+        self.fills = []
+        self.active = []
+
+    def get_updates(self, order_ref: str) -> BrokerUpdate:
+        return BrokerUpdate(self.fills, self.active, [])
+
+def _tx(tx_id, day, qty, price):
+    return TradeTransaction(
+        id=tx_id, timestamp=datetime(2025, 1, day), type=TransactionType.ENTRY,
+        quantity=qty, price=price, commission=1.0
+    )
+
+def test_metrics_build_and_reduce():
+    # Buy 10 @ 100, Buy 10 @ 110 -> Avg 105. Sell 5 @ 120 -> Realized 75.
+    txs = [_tx("1", 1, 10, 100.0), _tx("2", 2, 10, 110.0), _tx("3", 3, -5, 120.0)]
+    m = TradeCalculator.calculate_metrics(txs, current_price=115.0, initial_risk=100.0)
+    assert m.net_quantity == 15
+    assert m.avg_price == 105.0
+    assert m.realized_pnl == 75.0
+    assert m.unrealized_pnl == 150.0 # (115 - 105) * 15
+    assert m.total_commissions == 3.0
+    assert m.r_multiple == 2.25
+
+def test_metrics_flip_and_close():
+    # Long 10 @ 100 -> Sell 20 @ 90 -> Short 10 @ 90 (Realized -100)
+    txs = [_tx("1", 1, 10, 100.0), _tx("2", 3, -20, 90.0)]
+    m = TradeCalculator.calculate_metrics(txs, current_price=80.0)
+    assert m.net_quantity == -10
+    assert m.avg_price == 90.0
+    assert m.realized_pnl == -100.0
+    assert m.unrealized_pnl == 100.0 # Short from 90 to 80
+
+    # Full close -> flat, days held until last transaction
+    txs = [_tx("1", 1, 10, 100.0), _tx("2", 5, -10, 110.0)]
+    m = TradeCalculator.calculate_metrics(txs, current_price=80.0)
+    assert m.net_quantity == 0
+    assert m.avg_price == 0.0
+    assert m.realized_pnl == 100.0
+    assert m.days_held == 4
+
+    # Re-open from flat goes through the building arm: basis is the new price
+    m = TradeCalculator.calculate_metrics(txs + [_tx("3", 6, 5, 120.0)], current_price=130.0)
+    assert m.net_quantity == 5
+    assert m.avg_price == 120.0
+    assert m.realized_pnl == 100.0
+
+    # Unsorted input is sorted before the replay (same result as time order)
+    m = TradeCalculator.calculate_metrics([txs[1], txs[0]], current_price=80.0)
+    assert m.realized_pnl == 100.0
+    assert m.days_held == 4
+
+    # Open position: days held against the caller's clock
+    m = TradeCalculator.calculate_metrics(txs[:1], current_price=80.0, now=datetime(2025, 1, 11))
+    assert m.days_held == 10
+
+def test_state_metrics_incremental():
+    # Incremental (cached) replay must match a full recompute, also for out-of-order fills
+    state = TradeState(id="TRD-INC", ticker="INC", status=TradeStatus.OPEN)
+    fills = [_tx("1", 1, 10, 100.0), _tx("2", 3, 10, 110.0), _tx("3", 2, -5, 120.0), _tx("4", 4, -20, 90.0)]
+    for tx in fills:
+        state.append_transaction(tx)
+        cached = TradeCalculator.calculate_state_metrics(state, current_price=100.0, initial_risk=50.0)
+        full = TradeCalculator.calculate_metrics(list(state.transactions), current_price=100.0, initial_risk=50.0)
+        assert cached == full
+    assert [t.id for t in state.transactions] == ["1", "3", "2", "4"]
+
+def test_fold_step_matches_batch():
+    from functools import reduce
+    txs = [_tx("1", 1, 10, 100.0), _tx("2", 2, 10, 110.0), _tx("3", 3, -25, 120.0)]
+    now = datetime(2025, 2, 1)
+    acc = reduce(fold_step, txs, INIT_FOLD)
+    assert TradeCalculator.metrics_from_fold(acc, 115.0, 100.0, now=now) == \
+        TradeCalculator.calculate_metrics(txs, 115.0, 100.0, now=now)
+
+def test_slippage_batch_matches_scalar():
+    triggers = [100.0, None, 0.0, 100.0]
+    execs = [101.0, 5.0, 5.0, 99.0]
+    qtys = [10, 10, 10, -10]
+    batch = TradeCalculator.calculate_slippage_batch(triggers, execs, qtys)
+    scalar = [TradeCalculator.calculate_slippage(t, e, q) for t, e, q in zip(triggers, execs, qtys)]
+    assert batch.tolist() == scalar # [-1, 0, 0, -1]
+
+def test_unknown_enum_values_raise_value_error():
+    data = TradeState(id="TRD-ENUM", ticker="ENUM", status=TradeStatus.OPEN).to_dict()
+    data["status"] = "LEGACY_STATUS"
+    try:
+        TradeState.from_dict(data)
+        assert False, "unknown status must not load"
+    except ValueError:
+        pass
+    assert TradeTransaction.from_dict(dict(_tx("1", 1, 1, 1.0).to_dict(), type="EXIT")).type == TransactionType.EXIT
+
+def test_transaction_arrays_roundtrip():
+    import io
+    import numpy as np
+    state = TradeState(id="TRD-NPZ", ticker="NPZ", status=TradeStatus.OPEN)
+    state.append_transaction(_tx("1", 1, 10, 100.0))
+    state.append_transaction(TradeTransaction(
+        id="2", timestamp=datetime(2025, 1, 2, 15, 30, 0, 123456), type=TransactionType.EXIT,
+        quantity=-10, price=101.5, commission=1.0, slippage=-0.25, order_id="O2"
+    ))
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **state.transaction_arrays())
+    buf.seek(0)
+    with np.load(buf) as arrays:
+        assert TradeState.transactions_from_arrays(arrays) == state.transactions
+
+def test_refresh_journal_roundtrip():
+    with tempfile.TemporaryDirectory() as storage_dir:
+        trade = TradeObject("JRNL", storage_dir=storage_dir)
+        trade.broker = MockBroker()
+        trade._state.status = TradeStatus.OPENING
+        trade._state.active_orders = {"O1": "ENTRY"}
+        trade.broker.active = ["O1"]
+        trade.save()
+
+        # Fill arrives, order disappears -> refresh appends to journal only
+        trade.broker.fills = [TradeTransaction(
+            id="E1", timestamp=datetime(2025, 1, 1), type=TransactionType.ENTRY,
+            quantity=10, price=100.0, commission=1.0, order_id="O1"
+        )]
+        trade.broker.active = []
+        trade.refresh(current_price=101.0)
+        assert os.path.exists(journal_path(trade.filepath))
+
+        # Reload: snapshot + journal replay
+        loaded = TradeObject("JRNL", id=trade.id, storage_dir=storage_dir)
+        assert loaded.status == TradeStatus.OPEN
+        assert len(loaded._state.transactions) == 1
+        assert len(loaded._state.order_history) == 1
+        assert loaded._state.active_orders == {}
+
+        # Full save compacts the journal; records are not applied twice
+        loaded.save()
+        assert not os.path.exists(journal_path(trade.filepath))
+        reloaded = TradeObject("JRNL", id=trade.id, storage_dir=storage_dir)
+        assert len(reloaded._state.transactions) == 1
+        print("Journal Roundtrip Verification PASSED")
+
+def test_journal_survives_torn_append():
+    from py_portfolio_state.history import HistoryFactory
+    with tempfile.TemporaryDirectory() as storage_dir:
+        trade = TradeObject("TORN", storage_dir=storage_dir)
+        trade.broker = MockBroker()
+        trade._state.status = TradeStatus.OPEN
+        trade.save()
+        trade.broker.fills = [_tx("E1", 1, 10, 100.0)]
+        trade.refresh(current_price=101.0)
+
+        # Crash mid-append: partial last line without newline
+        with open(journal_path(trade.filepath), "a") as f:
+            f.write('{"seq": 99, "head')
+        trade.broker.fills = [_tx("E1", 1, 10, 100.0), _tx("E2", 2, 5, 102.0)]
+        trade.refresh(current_price=101.0)
+
+        loaded = TradeObject("TORN", id=trade.id, storage_dir=storage_dir)
+        assert [t.id for t in loaded._state.transactions] == ["E1", "E2"]
+        assert (loaded._journal_seq, loaded._journal_records) == (trade._journal_seq, 2)
+
+        # Bulk loader carries the replayed journal position over as well
+        factory = HistoryFactory(storage_dir)
+        factory.load_all_trades()
+        cached, = factory._cache
+        assert (cached._journal_seq, cached._journal_records) == (trade._journal_seq, 2)
+
+def test_get_or_create_counts_journal_activity():
+    with tempfile.TemporaryDirectory() as storage_dir:
+        older = TradeObject("PICK", storage_dir=storage_dir)
+        older.save()
+        newer = TradeObject("PICK", storage_dir=storage_dir)
+        newer.save()
+        os.utime(older.filepath, (1000, 1000))
+        os.utime(newer.filepath, (2000, 2000))
+        assert TradeObject.get_or_create("PICK", None, storage_dir=storage_dir).id == newer.id
+
+        # A journal append on the older trade makes it the most recently active one
+        with open(journal_path(older.filepath), "w") as f:
+            f.write("")
+        os.utime(journal_path(older.filepath), (3000, 3000))
+        assert TradeObject.get_or_create("PICK", None, storage_dir=storage_dir).id == older.id
+
+def test_save_recreates_removed_ticker_dir():
+    import shutil
+    with tempfile.TemporaryDirectory() as storage_dir:
+        trade = TradeObject("GONE", storage_dir=storage_dir)
+        trade.save()
+        shutil.rmtree(os.path.dirname(trade.filepath))
+        trade.save()
+        assert os.path.exists(trade.filepath)
+
+        # New trades in a removed ticker directory recreate it as well
+        shutil.rmtree(os.path.dirname(trade.filepath))
+        other = TradeObject("GONE", storage_dir=storage_dir)
+        assert os.path.isdir(os.path.dirname(other.filepath))
+
+if __name__ == "__main__":
+    test_metrics_build_and_reduce()
+    test_metrics_flip_and_close()
+    test_state_metrics_incremental()
+    test_fold_step_matches_batch()
+    test_slippage_batch_matches_scalar()
+    test_unknown_enum_values_raise_value_error()
+    test_transaction_arrays_roundtrip()
+    test_refresh_journal_roundtrip()
+    test_journal_survives_torn_append()
+    test_get_or_create_counts_journal_activity()
+    test_save_recreates_removed_ticker_dir()